@@ -1,10 +1,13 @@
 from django.contrib import admin
-from .models import Attraction, Review
+from django.utils import timezone
+from .archive import restore_attractions, restore_reviews
+from .catalog import bump_catalog_version
+from .models import Attraction, ArchivedAttraction, ArchivedReview, Review
 
 # Register the Attraction model and customize its display in the admin panel.
 @admin.register(Attraction)
 class AttractionAdmin(admin.ModelAdmin):
-    list_display = ('name', 'status', 'category', 'contributor', 'is_open', 'created_at')
+    list_display = ('name', 'status', 'category', 'contributor', 'is_open', 'review_count', 'created_at')
     list_filter = ('status', 'category', 'is_open')
     search_fields = ('name', 'description')
     date_hierarchy = 'created_at'
@@ -13,15 +16,52 @@ class AttractionAdmin(admin.ModelAdmin):
     actions = ['approve_attractions', 'reject_attractions']
 
     def approve_attractions(self, request, queryset):
-        updated_count = queryset.update(status='APPROVED')
+        updated_count = queryset.update(status='APPROVED', updated_at=timezone.now())
+        # queryset.update() skips model signals, so invalidate by hand.
+        bump_catalog_version()
         self.message_user(request, f"{updated_count} attractions were successfully marked as Approved.")
     approve_attractions.short_description = "Mark selected attractions as Approved"
 
     def reject_attractions(self, request, queryset):
-        updated_count = queryset.update(status='REJECTED')
+        # updated_at marks when it was rejected; `manage.py archive` ages from it.
+        updated_count = queryset.update(status='REJECTED', updated_at=timezone.now())
+        bump_catalog_version()
         self.message_user(request, f"{updated_count} attractions were marked as Rejected.")
     reject_attractions.short_description = "Mark selected attractions as Rejected"
 
 @admin.register(Review)
 class ReviewAdmin(admin.ModelAdmin):
-    list_display = ('attraction', 'user', 'rating', 'created_at')
\ No newline at end of file
+    list_display = ('attraction', 'user', 'rating', 'created_at')
+
+
+# Archived rows are read-only here; "Restore" moves them back (see archive.py).
+class ArchiveAdmin(admin.ModelAdmin):
+    readonly_fields = ('original_id', 'data', 'archived_at')
+    date_hierarchy = 'archived_at'
+    actions = ['restore_selected']
+    restore = None
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def restore_selected(self, request, queryset):
+        restored, skipped = self.restore(queryset)
+        self.message_user(request, f"{restored} restored.")
+        for message in skipped:
+            self.message_user(request, f"Skipped {message}.", level='warning')
+    restore_selected.short_description = "Restore selected to the live tables"
+
+@admin.register(ArchivedAttraction)
+class ArchivedAttractionAdmin(ArchiveAdmin):
+    list_display = ('original_id', 'name', 'status', 'archived_at')
+    search_fields = ('name',)
+    restore = staticmethod(restore_attractions)
+
+@admin.register(ArchivedReview)
+class ArchivedReviewAdmin(ArchiveAdmin):
+    list_display = ('original_id', 'attraction_id', 'archived_at')
+    search_fields = ('=attraction_id',)
+    restore = staticmethod(restore_reviews)
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class AttractionsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'attractions'
+
+    def ready(self):
+        # Connect model signal receivers.
+        from . import signals  # noqa: F401
@@ -0,0 +1,195 @@
+"""
+Archival of cold rows out of the hot Attraction and Review tables.
+
+Moved rows are kept in ``ArchivedAttraction`` / ``ArchivedReview`` as
+serializer-format JSON and can be restored with their original pks. Two
+kinds of rows are archived:
+
+- REJECTED attractions not modified for a while, together with any of
+  their reviews;
+- stale reviews older than a cutoff, except each attraction's most recent
+  ones, which stay visible on its detail page.
+
+Every batch is one short transaction (insert archive rows, delete hot
+rows), so locks are held only for a batch and an interrupted run simply
+resumes on the next invocation: whatever was not yet moved still matches
+the criteria.
+
+``Attraction.review_count`` / ``rating_total`` keep counting archived
+reviews, so ratings and popularity do not change when old reviews leave
+the hot table. To keep that exact, an archived review still blocks its
+author from reviewing the attraction again (``Attraction.has_review_from``),
+deleting a user drops their archived reviews from the counters, and a
+restored attraction has its counters recomputed from live plus archived
+rows. Images stay in storage so restored attractions keep their photo.
+"""
+from django.contrib.auth.models import User
+from django.core import serializers
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .catalog import bump_catalog_version
+from .models import Attraction, ArchivedAttraction, ArchivedReview, Review
+from .signals import recount_review_counters, signals_suspended
+
+
+def _snapshot(instance):
+    return serializers.serialize('python', [instance])[0]['fields']
+
+
+def _deserialize(model, records):
+    """Rebuild unsaved model instances from archive ``records``."""
+    return serializers.deserialize(
+        'python',
+        [{'model': model._meta.label_lower, 'pk': r.original_id, 'fields': r.data} for r in records],
+        ignorenonexistent=True,
+    )
+
+
+# --- ARCHIVE ---
+
+def archive_reviews(reviews):
+    """Move ``reviews`` (Review instances) into ArchivedReview."""
+    with transaction.atomic(), signals_suspended():
+        ArchivedReview.objects.bulk_create(
+            ArchivedReview(
+                original_id=r.pk, attraction_id=r.attraction_id, user_id=r.user_id,
+                rating=r.rating, data=_snapshot(r),
+            )
+            for r in reviews
+        )
+        Review.objects.filter(pk__in=[r.pk for r in reviews]).delete()
+    return len(reviews)
+
+
+def archive_attractions(attractions):
+    """Move ``attractions`` and all their reviews into the archive tables."""
+    with transaction.atomic(), signals_suspended():
+        archive_reviews(list(Review.objects.filter(attraction__in=attractions)))
+        ArchivedAttraction.objects.bulk_create(
+            ArchivedAttraction(original_id=a.pk, name=a.name, status=a.status, data=_snapshot(a))
+            for a in attractions
+        )
+        # Cascades to the attraction's trending buckets.
+        Attraction.objects.filter(pk__in=[a.pk for a in attractions]).delete()
+    bump_catalog_version()
+    return len(attractions)
+
+
+def rejected_attractions(cutoff):
+    """REJECTED attractions not modified since ``cutoff``."""
+    return Attraction.objects.filter(status='REJECTED', updated_at__lt=cutoff).order_by('pk')
+
+
+def stale_reviews(cutoff, keep_latest, exclude_attractions=()):
+    """
+    Yield ``(attraction_id, queryset)`` for every attraction with reviews
+    older than ``cutoff`` beyond its ``keep_latest`` newest ones, skipping
+    ``exclude_attractions``. Each queryset is ordered oldest first and
+    walks the (attraction, created_at) index.
+    """
+    candidates = list(
+        Review.objects.filter(created_at__lt=cutoff)
+        .exclude(attraction_id__in=exclude_attractions)
+        .order_by('attraction_id')
+        .values_list('attraction_id', flat=True)
+        .distinct()
+    )
+    for attraction_id in candidates:
+        reviews = Review.objects.filter(attraction_id=attraction_id, created_at__lt=cutoff)
+        if keep_latest:
+            oldest_kept = (
+                Review.objects.filter(attraction_id=attraction_id)
+                .order_by('-created_at', '-pk')
+                .values_list('created_at', 'pk')[keep_latest - 1:keep_latest]
+                .first()
+            )
+            if oldest_kept is None:
+                continue  # Fewer than keep_latest reviews: keep them all.
+            kept_at, kept_pk = oldest_kept
+            reviews = reviews.filter(Q(created_at__lt=kept_at) | Q(created_at=kept_at, pk__lt=kept_pk))
+        yield attraction_id, reviews.order_by('created_at', 'pk')
+
+
+# --- RESTORE ---
+
+def restore_attractions(records):
+    """
+    Restore ``records`` (ArchivedAttraction) with their archived reviews.
+
+    Returns ``(restored, skipped)``: the number restored and a list of
+    messages for records left in the archive (e.g. the name is taken).
+    """
+    records = list(records)
+    taken = set(
+        Attraction.objects.filter(name__in=[r.name for r in records]).values_list('name', flat=True)
+    )
+    restored, skipped = [], []
+    with transaction.atomic(), signals_suspended():
+        for record in records:
+            if record.name in taken:
+                skipped.append(f"attraction #{record.original_id}: name {record.name!r} is in use")
+                continue
+            taken.add(record.name)
+            restored.append(record)
+        users = _existing_users(r.data.get('contributor') for r in restored)
+        now = timezone.now()
+        for obj in _deserialize(Attraction, restored):
+            if obj.object.contributor_id not in users:
+                # Same outcome as deleting the contributor (on_delete=SET_NULL).
+                obj.object.contributor_id = None
+            # Restart the archival clock, or the next run archives it again.
+            obj.object.updated_at = now
+            obj.save()
+        ArchivedAttraction.objects.filter(pk__in=[r.pk for r in restored]).delete()
+        _, review_skipped = restore_reviews(
+            ArchivedReview.objects.filter(attraction_id__in=[r.original_id for r in restored])
+        )
+        # The archived counters miss changes made while archived (deleted users).
+        recount_review_counters([r.original_id for r in restored])
+    bump_catalog_version()
+    skipped.extend(review_skipped)
+    return len(restored), skipped
+
+
+def restore_reviews(records):
+    """
+    Restore ``records`` (ArchivedReview) whose attraction and author still
+    exist and who has not reviewed that attraction again since.
+
+    Returns ``(restored, skipped)`` like ``restore_attractions``.
+    """
+    records = list(records)
+    contributors = dict(
+        Attraction.objects.filter(pk__in={r.attraction_id for r in records}).values_list('pk', 'contributor_id')
+    )
+    attraction_ids = set(contributors)
+    users = _existing_users(r.user_id for r in records)
+    reviewed = set(
+        Review.objects.filter(attraction_id__in=attraction_ids).values_list('attraction_id', 'user_id')
+    )
+    restored, skipped = [], []
+    for record in records:
+        user_id = record.user_id
+        if record.attraction_id not in attraction_ids:
+            skipped.append(f"review #{record.original_id}: its attraction is not in the live table")
+        elif user_id not in users:
+            skipped.append(f"review #{record.original_id}: its author no longer exists")
+        elif (record.attraction_id, user_id) in reviewed:
+            skipped.append(f"review #{record.original_id}: its author has reviewed the attraction again")
+        else:
+            reviewed.add((record.attraction_id, user_id))
+            restored.append(record)
+
+    with transaction.atomic(), signals_suspended():
+        for obj in _deserialize(Review, restored):
+            # The archived copy may predate a contributor change or deletion.
+            obj.object.attraction_contributor_id = contributors[obj.object.attraction_id]
+            obj.save()
+        ArchivedReview.objects.filter(pk__in=[r.pk for r in restored]).delete()
+    return len(restored), skipped
+
+
+def _existing_users(user_ids):
+    return set(User.objects.filter(pk__in={pk for pk in user_ids if pk}).values_list('pk', flat=True))
@@ -0,0 +1,24 @@
+from django.core.cache import cache
+
+# Cache key holding a counter that changes whenever the public catalog
+# (approved attractions and their reviews) changes. Per-process structures
+# built from the catalog compare against it to know when to rebuild.
+CATALOG_VERSION_KEY = 'attractions:catalog_version'
+
+
+def get_catalog_version():
+    """Return the current catalog version, initialising it if missing."""
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, 1, timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY, 1)
+    return version
+
+
+def bump_catalog_version():
+    """Mark every structure built from the catalog as stale."""
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        # Key missing (cold cache or evicted): start a fresh counter.
+        cache.set(CATALOG_VERSION_KEY, 2, timeout=None)
@@ -1,6 +1,16 @@
 from django.contrib.auth.forms import UserCreationForm
 from django import forms
+from django.core import signing
+from django.urls import reverse_lazy
 from .models import Review, Attraction
+from .uploads import (
+    ALLOWED_CONTENT_TYPES,
+    MAX_IMAGE_BYTES,
+    ImageRejected,
+    get_direct_upload_backend,
+    is_upload_claimable,
+    unsign_upload_key,
+)
 
 class CustomUserCreationForm(UserCreationForm):
     """Custom form for user registration."""
@@ -51,12 +61,26 @@ class ReviewForm(forms.ModelForm):
 
 class AttractionForm(forms.ModelForm):
     """Custom form for attraction creation/editing with validation."""
+    # Signed token for a photo already sent straight to storage (see uploads.py).
+    image_upload = forms.CharField(required=False, widget=forms.HiddenInput)
+
     class Meta:
         model = Attraction
         fields = ['name', 'description', 'category', 'location', 'latitude', 'longitude', 'image', 'is_open']
         widgets = {
             'description': forms.Textarea(attrs={'rows': 5}),
+            'image': forms.ClearableFileInput(attrs={
+                'accept': ','.join(ALLOWED_CONTENT_TYPES),
+                'data-presign-url': reverse_lazy('direct_upload_presign'),
+            }),
         }
+
+    def __init__(self, *args, upload_errors=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Rejections recorded by ImageUploadHandler while the request streamed in.
+        self.upload_errors = upload_errors or {}
+        # Key of a verified direct upload; the view claims it when saving.
+        self.direct_upload_key = None
     
     def clean_latitude(self):
         latitude = self.cleaned_data.get('latitude')
@@ -73,13 +97,35 @@ class AttractionForm(forms.ModelForm):
         return longitude
     
     def clean_image(self):
+        if 'image' in self.upload_errors:
+            raise forms.ValidationError(self.upload_errors['image'])
         image = self.cleaned_data.get('image')
         if image:
             # Check file size (max 5MB)
-            if image.size > 5 * 1024 * 1024:
+            if image.size > MAX_IMAGE_BYTES:
                 raise forms.ValidationError("Image file too large (maximum 5MB).")
             # Check file extension
             valid_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.webp']
             if not any(image.name.lower().endswith(ext) for ext in valid_extensions):
                 raise forms.ValidationError("Unsupported file format. Please upload a JPG, PNG, GIF, or WEBP image.")
-        return image
\ No newline at end of file
+        return image
+
+    def clean(self):
+        cleaned_data = super().clean()
+        token = cleaned_data.get('image_upload')
+        # A file posted with the form wins over an earlier direct upload.
+        if not token or self.files.get('image'):
+            return cleaned_data
+        try:
+            key = unsign_upload_key(token)
+            if not is_upload_claimable(key):
+                raise ImageRejected("This photo upload has already been used. Please choose the image again.")
+            get_direct_upload_backend().verify(key)
+        except signing.BadSignature:
+            self.add_error('image', "The photo upload expired. Please choose the image again.")
+        except ImageRejected as e:
+            self.add_error('image', str(e))
+        else:
+            cleaned_data['image'] = key
+            self.direct_upload_key = key
+        return cleaned_data
@@ -0,0 +1,60 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from attractions.archive import archive_attractions, archive_reviews, rejected_attractions, stale_reviews
+
+
+class Command(BaseCommand):
+    help = (
+        "Move old REJECTED attractions and stale reviews into the archive "
+        "tables in small batches. Safe to interrupt and re-run; restore "
+        "with `manage.py unarchive`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rejected-older-than', type=int, default=90, metavar='DAYS',
+                            help="Archive REJECTED attractions not modified for DAYS days.")
+        parser.add_argument('--reviews-older-than', type=int, default=730, metavar='DAYS',
+                            help="Archive reviews older than DAYS days.")
+        parser.add_argument('--keep-latest', type=int, default=20, metavar='N',
+                            help="Never archive an attraction's N most recent reviews.")
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--pause', type=float, default=0.0, metavar='SECONDS',
+                            help="Sleep between batches to leave room for live traffic.")
+        parser.add_argument('--dry-run', action='store_true', help="Only report what would be archived.")
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1 or options['keep_latest'] < 0:
+            raise CommandError("--batch-size must be positive and --keep-latest non-negative.")
+        now = timezone.now()
+        self.options = options
+
+        attractions = rejected_attractions(now - timedelta(days=options['rejected_older_than']))
+        # In a dry run they are still there; their reviews would leave with them.
+        leaving = list(attractions.values_list('pk', flat=True)) if options['dry_run'] else []
+        moved = self.run_batches(attractions, archive_attractions)
+        self.stdout.write(f"Rejected attractions {'to archive' if options['dry_run'] else 'archived'}: {moved}")
+
+        moved = 0
+        cutoff = now - timedelta(days=options['reviews_older_than'])
+        for _, reviews in stale_reviews(cutoff, options['keep_latest'], exclude_attractions=leaving):
+            moved += self.run_batches(reviews, archive_reviews)
+        self.stdout.write(f"Stale reviews {'to archive' if options['dry_run'] else 'archived'}: {moved}")
+
+    def run_batches(self, queryset, archive):
+        """Archive ``queryset`` one batch at a time; archived rows drop out of it."""
+        if self.options['dry_run']:
+            return queryset.count()
+        moved = 0
+        while True:
+            batch = list(queryset[:self.options['batch_size']])
+            if not batch:
+                return moved
+            moved += archive(batch)
+            if self.options['verbosity'] > 1:
+                self.stdout.write(f"  moved {moved} {queryset.model._meta.verbose_name_plural}")
+            if self.options['pause']:
+                time.sleep(self.options['pause'])
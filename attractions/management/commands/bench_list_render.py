@@ -0,0 +1,84 @@
+import statistics
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import AnonymousUser
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.template.loader import get_template
+from django.test import RequestFactory
+from django.utils import timezone
+
+from attractions.models import Attraction
+from attractions.views import map_markers
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark rendering attraction_list.html with N cards, with the "
+        "card fragment cache cold (every card rendered) and warm."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[10, 100, 1000])
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        template = get_template('attractions/attraction_list.html')
+        request = RequestFactory().get('/attractions/')
+        request.user = AnonymousUser()
+        categories = Attraction.category.field.choices
+        # {% cache %} prefers a dedicated 'template_fragments' cache.
+        fragments = caches['template_fragments' if 'template_fragments' in settings.CACHES else 'default']
+
+        self.stdout.write(f"{'cards':>6} {'cold ms':>10} {'warm ms':>10} {'cold us/card':>13} {'warm us/card':>13}")
+        for size in options['sizes']:
+            attractions = self._attractions(size)
+            context = {
+                'object_list': attractions,
+                'map_markers': map_markers(attractions),
+                'is_paginated': False,
+                'query': '',
+                'category_filter': 'ALL',
+                'categories': categories,
+            }
+            cold, warm = [], []
+            for _ in range(options['repeat']):
+                fragments.clear()
+                cold.append(self._render(template, context, request))
+                warm.append(self._render(template, context, request))
+
+            cold_ms, warm_ms = statistics.median(cold), statistics.median(warm)
+            self.stdout.write(
+                f"{size:>6} {cold_ms:>10.2f} {warm_ms:>10.2f} "
+                f"{cold_ms * 1000 / size:>13.1f} {warm_ms * 1000 / size:>13.1f}"
+            )
+
+    def _render(self, template, context, request):
+        start = time.perf_counter()
+        template.render(context, request)
+        return (time.perf_counter() - start) * 1000
+
+    def _attractions(self, size):
+        """Unsaved attractions shaped like the list view's queryset rows."""
+        now = timezone.now()
+        attractions = []
+        for i in range(size):
+            attraction = Attraction(
+                pk=i + 1,
+                name=f"Benchmark Attraction {i}",
+                description="A detailed overview of the attraction. " * 5,
+                category=Attraction.category.field.choices[i % 4][0],
+                location="Roxas Avenue, Davao City",
+                latitude=Decimal('7.068600'),
+                longitude=Decimal('125.606300'),
+                is_open=bool(i % 3),
+                status='APPROVED',
+                review_count=i % 2,
+                rating_total=(i % 5) + 1 if i % 2 else 0,
+                updated_at=now - timedelta(minutes=i),
+            )
+            attractions.append(attraction)
+        return attractions
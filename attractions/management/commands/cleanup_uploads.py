@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from attractions.uploads import delete_expired_uploads
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete direct-upload keys whose token has expired, together with "
+        "the stored file when the upload was never attached to an attraction. "
+        "Run periodically (e.g. hourly from cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        removed = delete_expired_uploads(batch_size=options['batch_size'])
+        self.stdout.write(f"Deleted {removed} unclaimed upload(s).")
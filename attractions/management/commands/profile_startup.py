@@ -0,0 +1,149 @@
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter under `-X importtime`: import the entry point,
+# then serve one request (cold) and a second one (warm) through it.
+PROBE = r'''
+import asyncio, importlib, io, json, sys, time
+
+start = time.perf_counter()
+target, path, host = sys.argv[1:4]
+application = importlib.import_module(f'city_guide.{target}').application
+loaded = time.perf_counter()
+
+def wsgi_request():
+    environ = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '',
+        'SERVER_NAME': host, 'SERVER_PORT': '80', 'HTTP_HOST': host,
+        'SERVER_PROTOCOL': 'HTTP/1.1', 'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr,
+    }
+    status = []
+    body = b''.join(application(environ, lambda s, h, e=None: status.append(s)))
+    return int(status[0].split()[0]), len(body)
+
+def asgi_request():
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+        'query_string': b'', 'headers': [(b'host', host.encode())],
+        'server': (host, 80), 'client': ('127.0.0.1', 0),
+    }
+    sent, received = [], []
+    async def receive():
+        if not received:
+            received.append(True)
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # No disconnect: wait until the server cancels us after responding.
+        await asyncio.get_running_loop().create_future()
+    async def send(message):
+        sent.append(message)
+    asyncio.run(application(scope, receive, send))
+    status = next(m['status'] for m in sent if m['type'] == 'http.response.start')
+    return status, sum(len(m.get('body', b'')) for m in sent if m['type'] == 'http.response.body')
+
+request = wsgi_request if target == 'wsgi' else asgi_request
+status, size = request()
+first = time.perf_counter()
+request()
+second = time.perf_counter()
+
+print(json.dumps({
+    'import_ms': (loaded - start) * 1000,
+    'first_request_ms': (first - loaded) * 1000,
+    'second_request_ms': (second - first) * 1000,
+    'time_to_first_request_ms': (first - start) * 1000,
+    'status': status,
+    'bytes': size,
+}))
+'''
+
+
+def parse_importtime(stderr):
+    """
+    Parse ``-X importtime`` output into ``(module, self_us, cumulative_us)``
+    tuples, skipping anything else written to stderr.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, module = line[len('import time:'):].split('|')
+            rows.append((module.strip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Profile cold start of the WSGI/ASGI entry points: import-time "
+        "breakdown (from -X importtime) and time to the first request."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', choices=['wsgi', 'asgi', 'both'], default='both')
+        parser.add_argument('--path', default='/attractions/', help="Path for the first request.")
+        parser.add_argument('--top', type=int, default=15, help="Rows per breakdown table.")
+        parser.add_argument('--lean', action='store_true', help="Profile with LEAN_BOOT=True.")
+
+    def handle(self, *args, **options):
+        targets = ['wsgi', 'asgi'] if options['target'] == 'both' else [options['target']]
+        for target in targets:
+            self.profile(target, options)
+
+    def profile(self, target, options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE='city_guide.settings')
+        if options['lean']:
+            env['LEAN_BOOT'] = 'True'
+
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', PROBE, target, options['path'], self.host()],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            raise CommandError(f"{target} probe failed:\n{proc.stderr[-4000:]}")
+        timings = json.loads(proc.stdout.strip().splitlines()[-1])
+        rows = parse_importtime(proc.stderr)
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"\ncity_guide.{target}{' (LEAN_BOOT)' if options['lean'] else ''}"
+        ))
+        self.stdout.write(
+            f"  modules imported:        {len(rows)}\n"
+            f"  total import self time:  {sum(r[1] for r in rows) / 1000:.1f} ms\n"
+            f"  import + setup:          {timings['import_ms']:.1f} ms\n"
+            f"  first request:           {timings['first_request_ms']:.1f} ms "
+            f"(HTTP {timings['status']}, {timings['bytes']} bytes)\n"
+            f"  second request:          {timings['second_request_ms']:.1f} ms\n"
+            f"  time to first response:  {timings['time_to_first_request_ms']:.1f} ms"
+        )
+
+        by_package = defaultdict(lambda: [0, 0])
+        for module, self_us, _ in rows:
+            package = by_package[module.split('.')[0]]
+            package[0] += self_us
+            package[1] += 1
+        top = options['top']
+
+        self.stdout.write(f"\n  {'top-level package':<32} {'self ms':>9} {'modules':>8}")
+        for package, (self_us, count) in sorted(by_package.items(), key=lambda kv: -kv[1][0])[:top]:
+            self.stdout.write(f"  {package:<32} {self_us / 1000:>9.1f} {count:>8}")
+
+        self.stdout.write(f"\n  {'module (by cumulative)':<48} {'cumul ms':>9} {'self ms':>8}")
+        for module, self_us, cumulative_us in sorted(rows, key=lambda r: -r[2])[:top]:
+            self.stdout.write(f"  {module[:48]:<48} {cumulative_us / 1000:>9.1f} {self_us / 1000:>8.1f}")
+
+    def host(self):
+        """A host the probe request will pass ALLOWED_HOSTS with."""
+        for host in settings.ALLOWED_HOSTS:
+            if host != '*' and '_' not in host:
+                return host.lstrip('.')
+        return 'localhost'
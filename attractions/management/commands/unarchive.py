@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from attractions.archive import restore_attractions, restore_reviews
+from attractions.models import ArchivedAttraction, ArchivedReview
+
+
+class Command(BaseCommand):
+    help = (
+        "Restore archived attractions (with their reviews) or reviews back "
+        "into the live tables, keeping their original ids."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--attractions', nargs='+', type=int, default=[], metavar='ID',
+                            help="Original ids of archived attractions to restore.")
+        parser.add_argument('--reviews', nargs='+', type=int, default=[], metavar='ID',
+                            help="Original ids of archived reviews to restore.")
+        parser.add_argument('--reviews-of', nargs='+', type=int, default=[], metavar='ATTRACTION_ID',
+                            help="Restore every archived review of these attractions.")
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        if not (options['attractions'] or options['reviews'] or options['reviews_of']):
+            raise CommandError("Nothing to restore: pass --attractions, --reviews or --reviews-of.")
+
+        jobs = [
+            ('attractions', restore_attractions,
+             ArchivedAttraction.objects.filter(original_id__in=options['attractions'])),
+            ('reviews', restore_reviews,
+             ArchivedReview.objects.filter(original_id__in=options['reviews'])
+             | ArchivedReview.objects.filter(attraction_id__in=options['reviews_of'])),
+        ]
+        for label, restore, queryset in jobs:
+            restored, skipped = 0, []
+            ids = list(queryset.order_by('original_id').values_list('pk', flat=True))
+            for start in range(0, len(ids), options['batch_size']):
+                batch = queryset.model.objects.filter(pk__in=ids[start:start + options['batch_size']])
+                count, batch_skipped = restore(batch)
+                restored += count
+                skipped.extend(batch_skipped)
+            self.stdout.write(f"Restored {label}: {restored}")
+            for message in skipped:
+                self.stdout.write(self.style.WARNING(f"  skipped {message}"))
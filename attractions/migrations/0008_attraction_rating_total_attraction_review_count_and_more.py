@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:05
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_review_counters(apps, schema_editor):
+    Attraction = apps.get_model('attractions', 'Attraction')
+    Review = apps.get_model('attractions', 'Review')
+    totals = (
+        Review.objects.order_by()
+        .values('attraction')
+        .annotate(count=Count('id'), total=Sum('rating'))
+    )
+    for row in totals.iterator():
+        Attraction.objects.filter(pk=row['attraction']).update(
+            review_count=row['count'], rating_total=row['total']
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attractions', '0007_attraction_attractions_status_aea291_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attraction',
+            name='rating_total',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='attraction',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_review_counters, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='attraction',
+            index=models.Index(fields=['contributor', 'status'], name='attractions_contrib_005b81_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attraction',
+            index=models.Index(fields=['contributor', '-created_at'], name='attractions_contrib_b8459a_idx'),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:13
+
+import django.db.models.deletion
+from datetime import timedelta, timezone as dt_timezone
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_review_activity(apps, schema_editor):
+    # Seed the trending buckets from reviews still inside their retention.
+    Review = apps.get_model('attractions', 'Review')
+    ReviewActivity = apps.get_model('attractions', 'ReviewActivity')
+    now = timezone.now()
+    retention = {'H': timedelta(hours=48), 'D': timedelta(days=30)}
+    buckets = {}
+    reviews = (
+        Review.objects.filter(created_at__gte=now - retention['D'])
+        .order_by('created_at')
+        .values_list('attraction_id', 'created_at')
+    )
+    for attraction_id, created_at in reviews.iterator():
+        starts = {'D': timezone.localtime(created_at).replace(hour=0, minute=0, second=0, microsecond=0)}
+        if created_at >= now - retention['H']:
+            starts['H'] = created_at.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+        for granularity, start in starts.items():
+            bucket = buckets.setdefault((attraction_id, granularity, start), [0, created_at])
+            bucket[0] += 1
+            bucket[1] = created_at
+    ReviewActivity.objects.bulk_create(
+        ReviewActivity(
+            attraction_id=attraction_id, granularity=granularity, bucket_start=start,
+            count=count, last_review_at=last,
+        )
+        for (attraction_id, granularity, start), (count, last) in buckets.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attractions', '0008_attraction_rating_total_attraction_review_count_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('H', 'Hourly'), ('D', 'Daily')], max_length=1)),
+                ('bucket_start', models.DateTimeField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('last_review_at', models.DateTimeField()),
+                ('attraction', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity', to='attractions.attraction')),
+            ],
+            options={
+                'verbose_name_plural': 'Review activity',
+                'indexes': [models.Index(fields=['granularity', 'bucket_start'], name='attractions_granula_8e1163_idx')],
+                'constraints': [models.UniqueConstraint(fields=('attraction', 'granularity', 'bucket_start'), name='unique_activity_bucket')],
+            },
+        ),
+        migrations.RunPython(backfill_review_activity, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:16
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attractions', '0009_reviewactivity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedAttraction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.PositiveBigIntegerField(unique=True)),
+                ('data', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('archived_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('name', models.CharField(db_index=True, max_length=150)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending Approval'), ('APPROVED', 'Approved'), ('REJECTED', 'Rejected')], max_length=10)),
+            ],
+            options={
+                'verbose_name_plural': 'Archived attractions',
+                'ordering': ['-archived_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedReview',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.PositiveBigIntegerField(unique=True)),
+                ('data', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('archived_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('attraction_id', models.PositiveBigIntegerField(db_index=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Archived reviews',
+                'ordering': ['-archived_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_attraction_contributor(apps, schema_editor):
+    Attraction = apps.get_model('attractions', 'Attraction')
+    Review = apps.get_model('attractions', 'Review')
+    Review.objects.update(attraction_contributor_id=Subquery(
+        Attraction.objects.filter(pk=OuterRef('attraction_id')).values('contributor_id')[:1]
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attractions', '0010_archive'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='attraction_contributor',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reviews_received', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(backfill_attraction_contributor, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['attraction_contributor', '-created_at'], name='attractions_attract_c873ce_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations, models
+
+
+def copy_user_and_rating(apps, schema_editor):
+    ArchivedReview = apps.get_model('attractions', 'ArchivedReview')
+    for record in ArchivedReview.objects.iterator():
+        record.user_id = record.data['user']
+        record.rating = record.data['rating']
+        record.save(update_fields=['user_id', 'rating'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attractions', '0012_directupload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedreview',
+            name='rating',
+            field=models.PositiveSmallIntegerField(default=0),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='archivedreview',
+            name='user_id',
+            field=models.PositiveBigIntegerField(default=0),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_user_and_rating, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='archivedreview',
+            index=models.Index(fields=['attraction_id', 'user_id'], name='attractions_attract_6cef98_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedreview',
+            index=models.Index(fields=['user_id'], name='attractions_user_id_8accb2_idx'),
+        ),
+    ]
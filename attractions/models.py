@@ -1,3 +1,4 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.urls import reverse
 from django.contrib.auth.models import User 
@@ -72,6 +73,16 @@ class Attraction(models.Model):
         help_text="Admins must approve this before it is visible to the public."
     )
     
+    # --- REVIEW COUNTERS (maintained by signals.py on every review write) ---
+    review_count = models.PositiveIntegerField(
+        default=0,
+        editable=False
+    )
+    rating_total = models.PositiveIntegerField(
+        default=0,
+        editable=False
+    )
+    
     created_at = models.DateTimeField(
         auto_now_add=True
     )
@@ -87,11 +98,28 @@ class Attraction(models.Model):
             models.Index(fields=['category']),
             models.Index(fields=['contributor']),
             models.Index(fields=['created_at']),
+            # Contributor dashboard: per-status counts and newest-first paging.
+            models.Index(fields=['contributor', 'status']),
+            models.Index(fields=['contributor', '-created_at']),
         ]
         
     def __str__(self):
         return f"{self.name} ({self.get_status_display()})"
 
+    @property
+    def average_rating(self):
+        """Mean star rating from the maintained counters, or None if unrated."""
+        if not self.review_count:
+            return None
+        return self.rating_total / self.review_count
+
+    def has_review_from(self, user):
+        """True if ``user`` has reviewed this attraction, archived reviews included."""
+        return (
+            self.reviews.filter(user=user).exists()
+            or ArchivedReview.objects.filter(attraction_id=self.pk, user_id=user.pk).exists()
+        )
+
     def get_absolute_url(self):
         return reverse('attraction_detail', kwargs={'pk': self.pk})
 
@@ -115,6 +143,16 @@ class Review(models.Model):
         User, 
         on_delete=models.CASCADE
     )
+    # Copy of attraction.contributor (kept in sync by signals.py) so the
+    # contributor dashboard reads its latest reviews from one index.
+    attraction_contributor = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='reviews_received'
+    )
     rating = models.IntegerField(
         choices=RATING_CHOICES, 
         default=5
@@ -133,7 +171,141 @@ class Review(models.Model):
         indexes = [
             models.Index(fields=['attraction', 'created_at']),
             models.Index(fields=['user']),
+            models.Index(fields=['attraction_contributor', '-created_at']),
+        ]
+
+    def __str__(self):
+        return f'{self.attraction.name} - {self.rating} stars by {self.user.username}'
+
+# --- TRENDING BUCKETS (maintained by signals.py, read by trending.py) ---
+
+class ReviewActivity(models.Model):
+    """
+    Number of reviews an attraction received in one hour or one day.
+
+    A compact rolling window: rows older than the retention for their
+    granularity are pruned, so the table stays proportional to recent
+    activity rather than to the full review history.
+    """
+    HOURLY = 'H'
+    DAILY = 'D'
+    GRANULARITY_CHOICES = [
+        (HOURLY, 'Hourly'),
+        (DAILY, 'Daily'),
+    ]
+
+    attraction = models.ForeignKey(
+        Attraction,
+        on_delete=models.CASCADE,
+        related_name='activity'
+    )
+    granularity = models.CharField(
+        max_length=1,
+        choices=GRANULARITY_CHOICES
+    )
+    bucket_start = models.DateTimeField()
+    count = models.PositiveIntegerField(
+        default=0
+    )
+    last_review_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name_plural = "Review activity"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['attraction', 'granularity', 'bucket_start'],
+                name='unique_activity_bucket',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['granularity', 'bucket_start']),
         ]
 
     def __str__(self):
-        return f'{self.attraction.name} - {self.rating} stars by {self.user.username}'
\ No newline at end of file
+        return f'{self.attraction_id} {self.get_granularity_display()} {self.bucket_start:%Y-%m-%d %H:00}: {self.count}'
+
+
+# --- ARCHIVE (written by archive.py; see `manage.py archive`) ---
+
+class ArchiveRecord(models.Model):
+    """
+    A row moved out of a hot table. ``data`` holds its field values in
+    Django's serializer format so it can be restored with the same pk.
+    """
+    original_id = models.PositiveBigIntegerField(
+        unique=True
+    )
+    data = models.JSONField(
+        encoder=DjangoJSONEncoder
+    )
+    archived_at = models.DateTimeField(
+        auto_now_add=True,
+        db_index=True
+    )
+
+    class Meta:
+        abstract = True
+
+
+class ArchivedAttraction(ArchiveRecord):
+    name = models.CharField(
+        max_length=150,
+        db_index=True
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=Attraction.STATUS_CHOICES
+    )
+
+    class Meta:
+        ordering = ['-archived_at']
+        verbose_name_plural = "Archived attractions"
+
+    def __str__(self):
+        return f"{self.name} (archived #{self.original_id})"
+
+
+class ArchivedReview(ArchiveRecord):
+    # Plain id, not a foreign key: the attraction may be archived too.
+    attraction_id = models.PositiveBigIntegerField(
+        db_index=True
+    )
+    # Copied out of ``data`` for the duplicate-review check and recounts.
+    user_id = models.PositiveBigIntegerField()
+    rating = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ['-archived_at']
+        verbose_name_plural = "Archived reviews"
+        indexes = [
+            models.Index(fields=['attraction_id', 'user_id']),
+            models.Index(fields=['user_id']),
+        ]
+
+    def __str__(self):
+        return f"Review #{self.original_id} of attraction #{self.attraction_id} (archived)"
+
+
+# --- DIRECT UPLOADS (see uploads.py) ---
+
+class DirectUpload(models.Model):
+    """
+    A storage key handed out for a direct photo upload. Each key can be
+    attached to one attraction only; keys never claimed are deleted, file
+    included, by `manage.py cleanup_uploads` once their token has expired.
+    """
+    key = models.CharField(
+        max_length=255,
+        unique=True
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        db_index=True
+    )
+    claimed_at = models.DateTimeField(
+        null=True,
+        blank=True
+    )
+
+    def __str__(self):
+        return self.key
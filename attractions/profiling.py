@@ -0,0 +1,239 @@
+"""
+Opt-in, per-request profiling for staff.
+
+Turned on with PROFILING_ENABLED. When it is off the middleware removes
+itself at startup (MiddlewareNotUsed), so there is no per-request cost.
+When it is on, a request is profiled only if the user is staff and either
+asks for it with a ``_profile`` query parameter or falls in the random
+PROFILING_SAMPLE_RATE sample:
+
+    /attractions/42/?_profile=1        cProfile (deterministic)
+    /attractions/42/?_profile=sample   stack sampling (low overhead)
+
+Every profiled request also records its SQL queries with timings. Results
+go to a ring buffer of at most PROFILING_MAX_ENTRIES entries in
+PROFILING_DIR, and can be browsed at /admin/profiles/. Each entry
+stores a JSON summary plus a flamegraph-compatible file:
+
+- cProfile: ``.prof`` (pstats) for snakeviz, flameprof or gprof2dot.
+- sampling: ``.folded`` collapsed stacks for flamegraph.pl or speedscope.
+
+This module is imported at startup even when profiling is off, so the
+profiler modules (cProfile, pstats, marshal) are imported only when a
+request is actually profiled.
+"""
+import io
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+ENTRY_ID_RE = re.compile(r'^\d+-\d+$')
+SUMMARY_ROWS = 40
+
+# ``?_profile=`` values; anything else is ignored.
+PROFILE_MODES = {'1': 'cprofile', 'sample': 'sample'}
+
+
+def profile_dir():
+    return Path(getattr(settings, 'PROFILING_DIR', Path(settings.BASE_DIR) / 'profiles'))
+
+
+class SQLRecorder:
+    """``connection.execute_wrapper`` callback collecting query timings."""
+
+    def __init__(self, alias):
+        self.alias = alias
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                'db': self.alias,
+                'sql': sql,
+                'ms': round((time.perf_counter() - start) * 1000, 3),
+                'many': many,
+            })
+
+
+class StackSampler:
+    """
+    Samples one thread's Python stack on an interval from a helper thread
+    and counts collapsed stacks (``outer;...;inner``) for flame graphs.
+    """
+
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.stacks = Counter()
+        self._target = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='request-sampler', daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def folded(self):
+        return ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfileStore:
+    """Bounded on-disk ring buffer of profiling results."""
+
+    def __init__(self, directory=None, max_entries=None):
+        self.directory = Path(directory) if directory else profile_dir()
+        self.max_entries = max_entries or getattr(settings, 'PROFILING_MAX_ENTRIES', 50)
+
+    def save(self, meta, artifact_name, artifact_bytes):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entry_id = f"{time.time_ns()}-{os.getpid()}"
+        meta = dict(meta, id=entry_id, artifact=f"{entry_id}{artifact_name}")
+        (self.directory / meta['artifact']).write_bytes(artifact_bytes)
+        # Metadata last: an entry is listed only once it is complete.
+        (self.directory / f"{entry_id}.json").write_text(json.dumps(meta))
+        self._prune()
+        return entry_id
+
+    def _prune(self):
+        entries = sorted(self.directory.glob('*.json'))
+        for stale in entries[:max(0, len(entries) - self.max_entries)]:
+            for path in self.directory.glob(f"{stale.stem}.*"):
+                path.unlink(missing_ok=True)
+
+    def list(self):
+        entries = []
+        for path in sorted(self.directory.glob('*.json'), reverse=True):
+            try:
+                entries.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue
+        return entries
+
+    def get(self, entry_id):
+        if not ENTRY_ID_RE.match(entry_id):
+            return None
+        try:
+            return json.loads((self.directory / f"{entry_id}.json").read_text())
+        except (OSError, ValueError):
+            return None
+
+    def artifact_path(self, meta):
+        return self.directory / meta['artifact']
+
+
+class ProfilingMiddleware:
+    """Profiles selected staff requests end to end; see the module docstring."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'PROFILING_SAMPLE_RATE', 0.0)
+        self.store = ProfileStore()
+
+    def __call__(self, request):
+        mode = self.profile_mode(request)
+        if mode is None:
+            return self.get_response(request)
+        return self.profile(request, mode)
+
+    def profile_mode(self, request):
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_staff:
+            return None
+        requested = PROFILE_MODES.get(request.GET.get('_profile'))
+        if requested is not None:
+            return requested
+        if self.sample_rate and random.random() < self.sample_rate:
+            return 'sample'
+        return None
+
+    def profile(self, request, mode):
+        recorders = [SQLRecorder(conn.alias) for conn in connections.all()]
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for conn, recorder in zip(connections.all(), recorders):
+                stack.enter_context(conn.execute_wrapper(recorder))
+            if mode == 'cprofile':
+                import cProfile
+
+                profiler = cProfile.Profile()
+                profiler.enable()
+                try:
+                    response = self.get_response(request)
+                finally:
+                    profiler.disable()
+            else:
+                with StackSampler() as sampler:
+                    response = self.get_response(request)
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        if mode == 'cprofile':
+            artifact_name, artifact = '.prof', self._pstats_bytes(profiler)
+            summary = self._pstats_summary(profiler)
+        else:
+            artifact_name, artifact = '.folded', sampler.folded().encode()
+            summary = ''.join(
+                f"{count:>6}  {stack.rsplit(';', 1)[-1]}\n"
+                for stack, count in sampler.stacks.most_common(SUMMARY_ROWS)
+            )
+
+        queries = [q for recorder in recorders for q in recorder.queries]
+        entry_id = self.store.save({
+            'created': time.time(),
+            'method': request.method,
+            'path': request.get_full_path(),
+            'view': getattr(request.resolver_match, 'view_name', ''),
+            'user': request.user.get_username(),
+            'status': response.status_code,
+            'mode': mode,
+            'duration_ms': round(duration_ms, 2),
+            'sql_count': len(queries),
+            'sql_ms': round(sum(q['ms'] for q in queries), 2),
+            'sql': queries,
+            'summary': summary,
+        }, artifact_name, artifact)
+        response['X-Profile-Id'] = entry_id
+        return response
+
+    def _pstats_bytes(self, profiler):
+        import marshal
+
+        # dump_stats() only writes to a path; marshal the same data in memory.
+        profiler.create_stats()
+        return marshal.dumps(profiler.stats)
+
+    def _pstats_summary(self, profiler):
+        import pstats
+
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(SUMMARY_ROWS)
+        return out.getvalue()
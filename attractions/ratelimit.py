@@ -0,0 +1,166 @@
+"""
+Token-bucket rate limiting for write endpoints.
+
+Limits are configured per URL name in ``settings.RATELIMITS`` as
+``'<requests>/<period>'`` strings, where period is one of s, m, h or d
+(e.g. ``'5/m'``: bursts of up to 5, refilling at 5 per minute). Only
+unsafe methods (POST, PUT, PATCH, DELETE) are counted.
+
+Buckets are keyed by user for authenticated requests and by client IP
+otherwise, and live in the default cache so every worker shares them. If
+the cache is unreachable, a bounded in-process store takes over so the
+site keeps limiting (per worker) instead of failing open or erroring.
+
+Each check is one cache read and one cache write. The read-modify-write
+is not atomic, so concurrent requests may occasionally be admitted a
+token early; that is fine for abuse protection.
+"""
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.shortcuts import render
+
+logger = logging.getLogger(__name__)
+
+UNSAFE_METHODS = frozenset({'POST', 'PUT', 'PATCH', 'DELETE'})
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+@lru_cache(maxsize=None)
+def parse_rate(rate):
+    """Parse ``'10/h'`` into ``(capacity, period_seconds)``."""
+    count, _, period = rate.partition('/')
+    try:
+        return int(count), PERIODS[period.strip().lower()[:1]]
+    except (ValueError, KeyError):
+        raise ValueError(f"Invalid rate limit {rate!r}; expected e.g. '5/m'.")
+
+
+class LocalBucketStore:
+    """In-process LRU fallback used while the shared cache is unavailable."""
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            state = self._buckets.get(key)
+            if state is not None:
+                self._buckets.move_to_end(key)
+            return state
+
+    def set(self, key, state, timeout):
+        with self._lock:
+            self._buckets[key] = state
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_entries:
+                self._buckets.popitem(last=False)
+
+
+_local_store = LocalBucketStore()
+
+
+def _load(key):
+    try:
+        return cache.get(key), cache
+    except Exception:
+        logger.warning("Rate limit cache unavailable; using in-process buckets.", exc_info=True)
+        return _local_store.get(key), _local_store
+
+
+def consume(key, rate, now=None):
+    """
+    Take one token from the bucket at ``key``.
+
+    Returns ``(allowed, retry_after_seconds)``.
+    """
+    capacity, period = parse_rate(rate)
+    refill_per_second = capacity / period
+    now = time.time() if now is None else now
+
+    state, store = _load(key)
+    tokens, stamp = state if state is not None else (capacity, now)
+    tokens = min(capacity, tokens + max(0.0, now - stamp) * refill_per_second)
+
+    if tokens >= 1:
+        tokens -= 1
+        allowed, retry_after = True, 0.0
+    else:
+        allowed, retry_after = False, (1 - tokens) / refill_per_second
+
+    try:
+        # A full bucket after ``period`` is the same as no bucket, so let it expire.
+        store.set(key, (tokens, now), timeout=period)
+    except Exception:
+        _local_store.set(key, (tokens, now), timeout=period)
+    return allowed, retry_after
+
+
+def client_ip(request):
+    """
+    The client address. Behind a proxy (e.g. Render), set
+    RATELIMIT_USE_X_FORWARDED_FOR so the rightmost X-Forwarded-For entry,
+    the one appended by the proxy itself, is used instead of the proxy IP.
+    """
+    if getattr(settings, 'RATELIMIT_USE_X_FORWARDED_FOR', False):
+        forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '')
+        if forwarded:
+            return forwarded.rsplit(',', 1)[-1].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def bucket_key(request, url_name):
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        identity = f'user:{user.pk}'
+    else:
+        identity = f'ip:{client_ip(request)}'
+    return f'ratelimit:{url_name}:{identity}'
+
+
+class RateLimitMiddleware:
+    """
+    Answer 429 with Retry-After once a user or IP exhausts the bucket for
+    the requested URL name. Staff are never limited.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'RATELIMIT_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.rates = dict(getattr(settings, 'RATELIMITS', {}))
+        # Fail at startup, not on the first throttled request.
+        for rate in self.rates.values():
+            parse_rate(rate)
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method not in UNSAFE_METHODS:
+            return None
+        url_name = request.resolver_match.url_name if request.resolver_match else None
+        rate = self.rates.get(url_name)
+        if rate is None:
+            return None
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_staff:
+            return None
+
+        allowed, retry_after = consume(bucket_key(request, url_name), rate)
+        if allowed:
+            return None
+
+        response = render(request, '429.html', {'retry_after': math.ceil(retry_after)}, status=429)
+        response['Retry-After'] = str(math.ceil(retry_after))
+        return response
@@ -0,0 +1,271 @@
+"""
+In-memory prefix index used by the search box autocomplete.
+
+The index is built once per process from APPROVED attractions and answers
+prefix lookups with a bisect over a sorted array of tokens, so typing into
+the search box never touches the database. It is built, and later rebuilt
+when the catalog version (see ``catalog.py``) moves on or its popularity
+ranking is old, in a background thread; requests never wait for a build.
+
+Layout (flat arrays of machine ints rather than an object per entry):
+
+- ``keys``:     sorted list of unique, case-folded tokens (every
+                word-suffix of the name and of the location).
+- ``offsets``:  ``offsets[i]:offsets[i + 1]`` is the slice of ``postings``
+                belonging to ``keys[i]``.
+- ``postings``: document ranks. Documents are numbered in popularity order,
+                so a smaller rank is a more popular attraction and ranking a
+                set of matches is simply taking its smallest ranks.
+
+- ``tops``:     top ``MAX_RESULTS`` ranks of every key range that a prefix
+                can select and whose postings are too many to rank per
+                query (``SCAN_LIMIT``), keyed by ``(lo, hi)``.
+
+Because ``keys`` is sorted, every token sharing a prefix is contiguous, and
+so are its postings: a lookup is two bisects plus either a small slice to
+rank or a dict lookup, however many tokens share the prefix.
+"""
+import heapq
+import logging
+import threading
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left
+
+from django.db import connection
+from django.urls import reverse
+
+from .catalog import get_catalog_version
+from .models import Attraction
+
+logger = logging.getLogger(__name__)
+
+MAX_RESULTS = 10
+
+# Key ranges with more postings than this are ranked once at build time
+# instead of on every keystroke.
+SCAN_LIMIT = 256
+
+# Attraction writes bump the catalog version; don't rebuild more often
+# than this. New approvals show up in suggestions within this window.
+MIN_REBUILD_INTERVAL = 30
+
+# Reviews don't bump the version, so popularity ranking is refreshed by
+# rebuilding an index at least this old even if the catalog is unchanged.
+MAX_INDEX_AGE = 60 * 60
+
+def normalize(text):
+    """Case-fold and strip accents so 'Café' matches 'cafe'."""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).strip()
+
+
+def _words(text):
+    """Normalized words of ``text``; commas separate words like spaces."""
+    return normalize(text or '').replace(',', ' ').split()
+
+
+def _tokens(*fields):
+    """
+    Every word-suffix of each field, e.g. 'eagle center' -> {'eagle center',
+    'center'}, so a query can start at any word and span several.
+    """
+    tokens = set()
+    for field in fields:
+        words = _words(field)
+        for start in range(len(words)):
+            tokens.add(' '.join(words[start:]))
+    return tokens
+
+
+class PrefixIndex:
+    """Immutable prefix index over (id, name, location) rows."""
+
+    __slots__ = ('ids', 'names', 'locations', 'keys', 'offsets', 'postings', 'tops')
+
+    def __init__(self, rows):
+        """
+        ``rows`` yields ``(id, name, location)`` tuples, most popular first.
+        """
+        self.ids = array('Q')
+        self.names = []
+        self.locations = []
+        token_docs = {}
+
+        for rank, (pk, name, location) in enumerate(rows):
+            self.ids.append(pk)
+            self.names.append(name)
+            self.locations.append(location)
+            for token in _tokens(name, location):
+                token_docs.setdefault(token, []).append(rank)
+
+        self.keys = sorted(token_docs)
+        self.offsets = array('I', [0])
+        self.postings = array('I')
+        for key in self.keys:
+            # Ranks were appended in increasing order, so each posting
+            # list is already sorted by popularity.
+            self.postings.extend(token_docs[key])
+            self.offsets.append(len(self.postings))
+
+        self.tops = self._build_tops()
+
+    def _head(self, i):
+        """The most popular ranks of ``keys[i]``."""
+        start = self.offsets[i]
+        return self.postings[start:min(start + MAX_RESULTS, self.offsets[i + 1])]
+
+    def _build_tops(self):
+        """
+        Rank every key range shared by a prefix, bottom-up: a range's top
+        ranks are the smallest of its sub-ranges' tops and its own keys'
+        heads. The ranges are the nested intervals of common-prefix length
+        between neighbouring keys, walked with a stack.
+        """
+        keys, offsets = self.keys, self.offsets
+        tops = {}
+        # [common prefix length, first key, candidate ranks]
+        stack = [[0, 0, []]]
+        for i, key in enumerate(keys):
+            depth = _common_prefix_length(key, keys[i + 1]) if i + 1 < len(keys) else 0
+            if depth > stack[-1][0]:
+                stack.append([depth, i, list(self._head(i))])
+                continue
+            stack[-1][2].extend(self._head(i))
+            while depth < stack[-1][0]:
+                _, lo, candidates = stack.pop()
+                top = heapq.nsmallest(MAX_RESULTS, set(candidates))
+                if offsets[i + 1] - offsets[lo] > SCAN_LIMIT:
+                    tops[lo, i + 1] = array('I', top)
+                if depth > stack[-1][0]:
+                    stack.append([depth, lo, top])
+                else:
+                    stack[-1][2].extend(top)
+        return tops
+
+    def __len__(self):
+        return len(self.ids)
+
+    def search(self, prefix, limit=MAX_RESULTS):
+        """Return document ranks matching ``prefix``, most popular first."""
+        # Same word splitting as the tokens: 'roxas avenue, d' finds
+        # 'Roxas Avenue, Davao City'.
+        prefix = ' '.join(_words(prefix))
+        if not prefix:
+            return []
+        limit = min(limit, MAX_RESULTS)
+
+        lo = bisect_left(self.keys, prefix)
+        # Smallest string greater than every string starting with ``prefix``.
+        hi = bisect_left(self.keys, prefix[:-1] + chr(ord(prefix[-1]) + 1), lo)
+        if lo == hi:
+            return []
+        start, end = self.offsets[lo], self.offsets[hi]
+        if hi - lo == 1:
+            # One token: its posting list is already in popularity order.
+            return list(self.postings[start:min(end, start + limit)])
+        if end - start > SCAN_LIMIT:
+            return list(self.tops[lo, hi][:limit])
+        return heapq.nsmallest(limit, set(self.postings[start:end]))
+
+    def describe(self, rank):
+        pk = self.ids[rank]
+        return {
+            'id': pk,
+            'name': self.names[rank],
+            'location': self.locations[rank],
+            'url': reverse('attraction_detail', kwargs={'pk': pk}),
+        }
+
+
+def _common_prefix_length(a, b):
+    n = min(len(a), len(b))
+    for i in range(n):
+        if a[i] != b[i]:
+            return i
+    return n
+
+
+def build_index():
+    """Build a fresh index from the database, ranked by review count."""
+    rows = (
+        Attraction.objects.filter(status='APPROVED')
+        .order_by('-review_count', 'name')
+        .values_list('id', 'name', 'location')
+    )
+    return PrefixIndex(rows.iterator(chunk_size=2000))
+
+
+_index = None
+_index_version = None
+_index_built_at = 0.0
+_rebuilding = False
+_lock = threading.Lock()
+
+
+def _install(index, version):
+    global _index, _index_version, _index_built_at
+    _index, _index_version, _index_built_at = index, version, time.monotonic()
+
+
+def _rebuild_in_background(version):
+    global _rebuilding
+    try:
+        _install(build_index(), version)
+    except Exception:
+        logger.exception("Search index rebuild failed; keeping the previous index.")
+    finally:
+        _rebuilding = False
+        # This thread's connection would otherwise stay open until exit.
+        connection.close()
+
+
+def _start_rebuild(version):
+    global _rebuilding
+    with _lock:
+        if _rebuilding:
+            return
+        _rebuilding = True
+    threading.Thread(
+        target=_rebuild_in_background, args=(version,),
+        name='search-index-rebuild', daemon=True,
+    ).start()
+
+
+def get_index(wait=False):
+    """
+    Return this process's index, refreshing it when the catalog changed or
+    the index is older than MAX_INDEX_AGE.
+
+    Builds run in a background thread that swaps the new index in when it
+    is ready; requests keep answering from the current one meanwhile, or
+    get ``None`` before the first build finished. ``wait=True`` builds the
+    first index on the calling thread instead (the LEAN_BOOT warm-up, so
+    forked workers inherit it).
+    """
+    if _index is None:
+        version = get_catalog_version()
+        if not wait:
+            _start_rebuild(version)
+            return None
+        with _lock:
+            if _index is None:
+                _install(build_index(), version)
+        return _index
+
+    age = time.monotonic() - _index_built_at
+    if _rebuilding or age < MIN_REBUILD_INTERVAL:
+        return _index
+    version = get_catalog_version()
+    if _index_version != version or age >= MAX_INDEX_AGE:
+        _start_rebuild(version)
+    return _index
+
+
+def autocomplete(query, limit=MAX_RESULTS):
+    """Suggestions for ``query`` as JSON-ready dicts."""
+    index = get_index()
+    if index is None:
+        return []
+    return [index.describe(rank) for rank in index.search(query, limit)]
@@ -0,0 +1,138 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.contrib.auth.models import User
+from django.db.models import Count, F, Sum
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .catalog import bump_catalog_version
+from .models import ArchivedReview, Attraction, Review
+from .trending import forget_review, record_review
+
+_suspended = ContextVar('attractions_signals_suspended', default=False)
+
+
+@contextmanager
+def signals_suspended():
+    """
+    Skip catalog bumps, review counters and trending buckets for rows moved
+    in bulk by archive.py, which keeps the counters as they are and bumps
+    the catalog version once per batch itself.
+    """
+    token = _suspended.set(True)
+    try:
+        yield
+    finally:
+        _suspended.reset(token)
+
+
+# Only attraction writes move the catalog version. Review writes would
+# change popularity ranking too, but slightly stale ranking is fine for
+# suggestions and the search index refreshes it on its own (MAX_INDEX_AGE).
+@receiver(post_save, sender=Attraction)
+@receiver(post_delete, sender=Attraction)
+def attraction_changed(sender, instance, **kwargs):
+    if _suspended.get():
+        return
+    bump_catalog_version()
+
+
+# --- REVIEWS RECEIVED (Review.attraction_contributor) ---
+
+@receiver(pre_save, sender=Review)
+def copy_attraction_contributor(sender, instance, raw=False, **kwargs):
+    if instance._state.adding and not raw:
+        instance.attraction_contributor_id = instance.attraction.contributor_id
+
+
+@receiver(post_save, sender=Attraction)
+def sync_attraction_contributor(sender, instance, created, raw=False, **kwargs):
+    # Contributors only change through the admin; this is a no-op otherwise.
+    if created or raw or _suspended.get():
+        return
+    Review.objects.filter(attraction=instance).exclude(
+        attraction_contributor_id=instance.contributor_id
+    ).update(attraction_contributor_id=instance.contributor_id)
+
+
+# --- REVIEW COUNTERS ---
+# Attraction.review_count / rating_total replace per-row Avg/Count joins.
+# Updates use F() expressions so concurrent reviews don't lose increments.
+
+def _adjust_counters(attraction_id, count, rating):
+    Attraction.objects.filter(pk=attraction_id).update(
+        review_count=F('review_count') + count,
+        rating_total=F('rating_total') + rating,
+    )
+
+
+def recount_review_counters(attraction_ids):
+    """
+    Recompute the counters of ``attraction_ids`` from their live and
+    archived reviews (archived reviews keep counting; see archive.py).
+    """
+    totals = {pk: [0, 0] for pk in attraction_ids}
+    for rows in (
+        Review.objects.filter(attraction_id__in=totals).values_list('attraction_id'),
+        ArchivedReview.objects.filter(attraction_id__in=totals).values_list('attraction_id'),
+    ):
+        for attraction_id, count, rating in rows.order_by().annotate(Count('pk'), Sum('rating')):
+            totals[attraction_id][0] += count
+            totals[attraction_id][1] += rating
+    for attraction_id, (count, rating) in totals.items():
+        Attraction.objects.filter(pk=attraction_id).update(review_count=count, rating_total=rating)
+
+
+@receiver(pre_save, sender=Review)
+def remember_previous_rating(sender, instance, **kwargs):
+    # Ratings only change on admin edits; note the old one to apply a delta.
+    if instance.pk and not kwargs.get('raw'):
+        instance._previous_rating = (
+            Review.objects.filter(pk=instance.pk).values_list('rating', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Review)
+def count_saved_review(sender, instance, created, raw=False, **kwargs):
+    if raw or _suspended.get():
+        return
+    if created:
+        _adjust_counters(instance.attraction_id, 1, instance.rating)
+        return
+    previous = getattr(instance, '_previous_rating', None)
+    if previous is not None and previous != instance.rating:
+        _adjust_counters(instance.attraction_id, 0, instance.rating - previous)
+
+
+@receiver(post_delete, sender=Review)
+def count_deleted_review(sender, instance, **kwargs):
+    if _suspended.get():
+        return
+    _adjust_counters(instance.attraction_id, -1, -instance.rating)
+
+
+@receiver(post_delete, sender=User)
+def drop_archived_reviews_of_user(sender, instance, **kwargs):
+    # Live reviews cascade (and decrement above); archived ones go the same way.
+    archived = ArchivedReview.objects.filter(user_id=instance.pk)
+    attraction_ids = set(archived.values_list('attraction_id', flat=True))
+    if attraction_ids:
+        archived.delete()
+        recount_review_counters(attraction_ids)
+
+
+# --- TRENDING BUCKETS ---
+# Hourly/daily review counts per attraction for the trending feed (trending.py).
+
+@receiver(post_save, sender=Review)
+def record_review_activity(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and not _suspended.get():
+        record_review(instance.attraction_id, instance.created_at)
+
+
+@receiver(post_delete, sender=Review)
+def forget_review_activity(sender, instance, **kwargs):
+    if _suspended.get():
+        return
+    forget_review(instance.attraction_id, instance.created_at)
@@ -0,0 +1,85 @@
+// Search box suggestions served by the in-memory autocomplete endpoint.
+document.addEventListener('DOMContentLoaded', function() {
+    const input = document.getElementById('id_q');
+    const list = document.getElementById('autocomplete_results');
+    if (!input || !list || !input.dataset.autocompleteUrl) {
+        return;
+    }
+
+    const DEBOUNCE_MS = 150;
+    let timer = null;
+    let controller = null;
+
+    function hide() {
+        list.classList.add('hidden');
+        list.innerHTML = '';
+    }
+
+    function render(results) {
+        list.innerHTML = '';
+        if (results.length === 0) {
+            hide();
+            return;
+        }
+        results.forEach(function(result) {
+            const item = document.createElement('li');
+            const link = document.createElement('a');
+            link.href = result.url;
+            link.className = 'block px-4 py-2 hover:bg-davao-light';
+
+            const name = document.createElement('span');
+            name.className = 'font-medium text-davao-dark';
+            name.textContent = result.name;
+
+            const location = document.createElement('span');
+            location.className = 'block text-xs text-gray-500';
+            location.textContent = result.location;
+
+            link.appendChild(name);
+            link.appendChild(location);
+            item.appendChild(link);
+            list.appendChild(item);
+        });
+        list.classList.remove('hidden');
+    }
+
+    function fetchSuggestions(query) {
+        // Drop the in-flight request; only the latest keystroke matters.
+        if (controller) {
+            controller.abort();
+        }
+        controller = new AbortController();
+
+        const url = `${input.dataset.autocompleteUrl}?q=${encodeURIComponent(query)}`;
+        fetch(url, { signal: controller.signal })
+            .then(function(response) { return response.json(); })
+            .then(function(data) { render(data.results || []); })
+            .catch(function(e) {
+                if (e.name !== 'AbortError') {
+                    console.error("Error fetching suggestions:", e);
+                }
+            });
+    }
+
+    input.addEventListener('input', function() {
+        clearTimeout(timer);
+        const query = input.value.trim();
+        if (query.length === 0) {
+            hide();
+            return;
+        }
+        timer = setTimeout(function() { fetchSuggestions(query); }, DEBOUNCE_MS);
+    });
+
+    input.addEventListener('keydown', function(e) {
+        if (e.key === 'Escape') {
+            hide();
+        }
+    });
+
+    document.addEventListener('click', function(e) {
+        if (e.target !== input && !list.contains(e.target)) {
+            hide();
+        }
+    });
+});
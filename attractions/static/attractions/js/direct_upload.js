@@ -0,0 +1,72 @@
+// Sends the chosen photo straight to storage before the form is submitted,
+// so the form post only carries a small signed token. If anything fails the
+// file stays in the input and is uploaded with the form as usual.
+document.addEventListener('DOMContentLoaded', function() {
+    const fileInput = document.querySelector('input[type="file"][data-presign-url]');
+    const tokenInput = document.getElementById('id_image_upload');
+    if (!fileInput || !tokenInput || !window.fetch) {
+        return;
+    }
+
+    const form = fileInput.form;
+    const submitButton = form.querySelector('button[type="submit"]');
+    const csrfToken = form.querySelector('input[name="csrfmiddlewaretoken"]').value;
+
+    const status = document.createElement('span');
+    status.className = 'helptext';
+    fileInput.insertAdjacentElement('afterend', status);
+
+    function setBusy(busy, message) {
+        status.textContent = message;
+        if (submitButton) {
+            submitButton.disabled = busy;
+        }
+    }
+
+    fileInput.addEventListener('change', function() {
+        const file = fileInput.files[0];
+        tokenInput.value = '';
+        if (!file) {
+            return;
+        }
+        setBusy(true, 'Uploading photo…');
+
+        const presignData = new FormData();
+        presignData.append('content_type', file.type);
+
+        fetch(fileInput.dataset.presignUrl, {
+            method: 'POST',
+            headers: { 'X-CSRFToken': csrfToken },
+            body: presignData,
+        })
+            .then(function(response) {
+                if (!response.ok) {
+                    throw new Error('presign failed');
+                }
+                return response.json();
+            })
+            .then(function(presigned) {
+                const uploadData = new FormData();
+                Object.entries(presigned.upload.fields).forEach(function([name, value]) {
+                    uploadData.append(name, value);
+                });
+                // Storage backends expect the file as the last field.
+                uploadData.append('file', file);
+
+                return fetch(presigned.upload.url, { method: 'POST', body: uploadData })
+                    .then(function(response) {
+                        if (!response.ok) {
+                            throw new Error('upload failed');
+                        }
+                        tokenInput.value = presigned.token;
+                        // The photo is stored; don't send it again with the form.
+                        fileInput.value = '';
+                        setBusy(false, `Photo uploaded: ${file.name}`);
+                    });
+            })
+            .catch(function(e) {
+                console.error("Direct upload failed, falling back to form upload:", e);
+                setBusy(false, '');
+            });
+    });
+});
@@ -0,0 +1,170 @@
+from datetime import timedelta
+from io import StringIO
+import time
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .archive import restore_attractions
+from .models import ArchivedAttraction, ArchivedReview, Attraction, Review, ReviewActivity
+from .search import PrefixIndex
+from .trending import PERIOD, bucket_start, compute_feed
+
+
+class ArchiveTests(TestCase):
+    """`manage.py archive` / `unarchive` and the review counters they must preserve."""
+
+    def setUp(self):
+        self.users = [User.objects.create_user(f'user{i}') for i in range(4)]
+        self.approved = Attraction.objects.create(
+            name='Eden Nature Park', description='d', location='Toril', status='APPROVED',
+        )
+        self.rejected = Attraction.objects.create(
+            name='Closed Mall', description='d', location='Bajada', status='REJECTED',
+        )
+        for user, rating in zip(self.users, [5, 4, 3, 2]):
+            Review.objects.create(attraction=self.approved, user=user, rating=rating)
+        Review.objects.create(attraction=self.rejected, user=self.users[0], rating=1)
+
+        long_ago = timezone.now() - timedelta(days=1000)
+        # The three oldest reviews of the approved attraction are stale.
+        Review.objects.filter(attraction=self.approved, rating__gte=3).update(created_at=long_ago)
+        Review.objects.filter(attraction=self.rejected).update(created_at=long_ago)
+        Attraction.objects.filter(pk=self.rejected.pk).update(updated_at=long_ago)
+
+    def archive(self, *args):
+        out = StringIO()
+        call_command('archive', '--keep-latest', '2', *args, stdout=out)
+        return out.getvalue()
+
+    def counters(self, attraction):
+        attraction.refresh_from_db()
+        return attraction.review_count, attraction.rating_total
+
+    def test_dry_run_matches_real_run(self):
+        report = self.archive('--dry-run')
+        self.assertIn("Rejected attractions to archive: 1", report)
+        self.assertIn("Stale reviews to archive: 2", report)
+        self.assertEqual(Review.objects.count(), 5)
+
+        report = self.archive()
+        self.assertIn("Rejected attractions archived: 1", report)
+        self.assertIn("Stale reviews archived: 2", report)
+
+    def test_archive_keeps_counters_and_latest_reviews(self):
+        self.archive()
+
+        self.assertFalse(Attraction.objects.filter(pk=self.rejected.pk).exists())
+        self.assertEqual(ArchivedAttraction.objects.get().original_id, self.rejected.pk)
+        self.assertEqual(ArchivedReview.objects.count(), 3)
+        # The two newest reviews stay live; the rating still covers all four.
+        self.assertEqual(self.approved.reviews.count(), 2)
+        self.assertEqual(self.counters(self.approved), (4, 14))
+
+        # Running again finds nothing left to move.
+        self.assertIn("Stale reviews archived: 0", self.archive())
+
+    def test_restore_round_trip(self):
+        self.archive()
+        call_command(
+            'unarchive', '--attractions', str(self.rejected.pk),
+            '--reviews-of', str(self.approved.pk), stdout=StringIO(),
+        )
+
+        self.assertFalse(ArchivedAttraction.objects.exists())
+        self.assertFalse(ArchivedReview.objects.exists())
+        self.assertEqual(Review.objects.count(), 5)
+        self.assertEqual(self.counters(self.approved), (4, 14))
+        self.assertEqual(self.counters(self.rejected), (1, 1))
+        # A restored attraction is not archived again by the next run.
+        self.assertIn("Rejected attractions to archive: 0", self.archive('--dry-run'))
+
+    def test_archived_review_blocks_a_second_review(self):
+        self.archive()
+        self.client.force_login(self.users[0])
+        self.client.post(
+            reverse('add_review', kwargs={'pk': self.approved.pk}),
+            {'rating': 1, 'comment': 'Reviewing this place again.'},
+            HTTP_HOST='localhost',
+        )
+        self.assertFalse(Review.objects.filter(attraction=self.approved, user=self.users[0]).exists())
+        self.assertEqual(self.counters(self.approved), (4, 14))
+
+    def test_deleting_a_user_drops_their_archived_reviews(self):
+        self.archive()
+        user_id = self.users[0].pk
+        self.users[0].delete()
+
+        self.assertFalse(ArchivedReview.objects.filter(user_id=user_id).exists())
+        self.assertEqual(self.counters(self.approved), (3, 9))
+
+        # The archived attraction's stored counters are recomputed on restore.
+        restore_attractions(ArchivedAttraction.objects.all())
+        self.assertEqual(self.counters(self.rejected), (0, 0))
+
+
+class PrefixIndexTests(SimpleTestCase):
+    """Autocomplete lookups stay exact and fast when many names share words."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        leads = ['Davao', 'Samal', 'The']
+        cls.rows = [
+            (pk, f'{leads[pk % 3]} Garden Resort {pk}', 'Roxas Avenue, Davao City' if pk % 2 else 'Toril')
+            for pk in range(1, 30001)
+        ]
+        cls.index = PrefixIndex(cls.rows)
+
+    def search(self, query):
+        return [self.index.ids[rank] for rank in self.index.search(query)]
+
+    def test_common_leading_word_returns_most_popular(self):
+        # Rows are given most popular first, so the smallest pks win; odd
+        # pks also match 'dav' through their location.
+        self.assertEqual(self.search('dav'), [1, 3, 5, 6, 7, 9, 11, 12, 13, 15])
+        self.assertEqual(self.search('davao'), self.search('dav'))
+        self.assertEqual(self.search('the'), [2, 5, 8, 11, 14, 17, 20, 23, 26, 29])
+        self.assertEqual(self.search('samal garden resort 2'), [22, 25, 28, 202, 205, 208, 211, 214, 217, 220])
+
+    def test_query_is_split_into_words_like_the_tokens(self):
+        self.assertEqual(self.search('roxas avenue, d'), [1, 3, 5, 7, 9, 11, 13, 15, 17, 19])
+        self.assertEqual(self.search('davao  garden'), [3, 6, 9, 12, 15, 18, 21, 24, 27, 30])
+        self.assertEqual(self.search('Samal,  Garden'), [1, 4, 7, 10, 13, 16, 19, 22, 25, 28])
+
+    def test_lookups_stay_under_a_millisecond(self):
+        for query in ['d', 'dav', 'davao', 'the', 'the garden resort 1', 'roxas avenue, d']:
+            start = time.perf_counter()
+            for _ in range(100):
+                self.index.search(query)
+            self.assertLess((time.perf_counter() - start) / 100, 0.001, query)
+
+
+class TrendingWindowTests(TestCase):
+    """The trending windows sum exactly 24 hourly or 7 daily buckets."""
+
+    def setUp(self):
+        self.attraction = Attraction.objects.create(
+            name='People\'s Park', description='d', location='Palma Gil', status='APPROVED',
+        )
+
+    def trending_reviews(self, window, granularity, buckets):
+        # One review in each of the ``buckets`` most recent buckets.
+        current = bucket_start(timezone.now(), granularity)
+        ReviewActivity.objects.bulk_create(
+            ReviewActivity(
+                attraction=self.attraction, granularity=granularity,
+                bucket_start=current - n * PERIOD[granularity], count=1, last_review_at=timezone.now(),
+            )
+            for n in range(buckets)
+        )
+        return compute_feed(window)['trending'][0]['reviews']
+
+    def test_week_sums_seven_daily_buckets(self):
+        self.assertEqual(self.trending_reviews('week', ReviewActivity.DAILY, 8), 7)
+
+    def test_day_sums_twenty_four_hourly_buckets(self):
+        self.assertEqual(self.trending_reviews('day', ReviewActivity.HOURLY, 25), 24)
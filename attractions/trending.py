@@ -0,0 +1,162 @@
+"""
+Trending and recently-reviewed feed.
+
+Every new review increments two ``ReviewActivity`` buckets for its
+attraction: the hour and the (local) day it was written in. Buckets older
+than their retention are pruned as new ones open, so the table holds only
+recent activity and the feed never scans ``Review``:
+
+- trending today:     sum of the last 24 hourly buckets, the current one included
+- trending this week: sum of the last 7 daily buckets, today included
+- recently reviewed:  newest ``last_review_at`` among hourly buckets
+
+The computed feed is cached for ``FEED_CACHE_SECONDS``, so reading it on
+the list page or from the JSON endpoint is a single cache get.
+"""
+from datetime import timedelta, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F, Max, Sum
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Attraction, ReviewActivity
+
+FEED_SIZE = 5
+FEED_CACHE_SECONDS = 60
+FEED_CACHE_KEY = 'attractions:trending:{window}'
+
+RETENTION = {
+    ReviewActivity.HOURLY: timedelta(hours=48),
+    ReviewActivity.DAILY: timedelta(days=30),
+}
+
+PERIOD = {
+    ReviewActivity.HOURLY: timedelta(hours=1),
+    ReviewActivity.DAILY: timedelta(days=1),
+}
+
+# window name -> (bucket granularity, how far back it reaches)
+WINDOWS = {
+    'day': (ReviewActivity.HOURLY, timedelta(hours=24)),
+    'week': (ReviewActivity.DAILY, timedelta(days=7)),
+}
+DEFAULT_WINDOW = 'week'
+
+
+def bucket_start(when, granularity):
+    """Start of the hour (UTC) or local day containing ``when``."""
+    if granularity == ReviewActivity.HOURLY:
+        return when.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+    return timezone.localtime(when).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+# --- WRITES (called from signals.py) ---
+
+def record_review(attraction_id, when):
+    """Count one review written at ``when`` in its hourly and daily buckets."""
+    for granularity in RETENTION:
+        start = bucket_start(when, granularity)
+        buckets = ReviewActivity.objects.filter(
+            attraction_id=attraction_id, granularity=granularity, bucket_start=start
+        )
+        if buckets.update(count=F('count') + 1, last_review_at=when):
+            continue
+        try:
+            with transaction.atomic():
+                ReviewActivity.objects.create(
+                    attraction_id=attraction_id, granularity=granularity,
+                    bucket_start=start, count=1, last_review_at=when,
+                )
+        except IntegrityError:
+            # Another request opened the same bucket first.
+            buckets.update(count=F('count') + 1, last_review_at=when)
+            continue
+        prune_expired(granularity, start)
+
+
+def forget_review(attraction_id, when):
+    """Undo ``record_review`` for a deleted review, if its buckets still exist."""
+    for granularity in RETENTION:
+        ReviewActivity.objects.filter(
+            attraction_id=attraction_id, granularity=granularity,
+            bucket_start=bucket_start(when, granularity), count__gt=0,
+        ).update(count=F('count') - 1)
+
+
+def prune_expired(granularity, start):
+    """Delete expired buckets; runs at most once per bucket period site-wide."""
+    retention = RETENTION[granularity]
+    marker = f'attractions:activity_pruned:{granularity}:{start.timestamp():.0f}'
+    if cache.add(marker, True, timeout=int(retention.total_seconds())):
+        ReviewActivity.objects.filter(
+            granularity=granularity, bucket_start__lt=start - retention
+        ).delete()
+
+
+# --- READS ---
+
+def _describe(attraction, **extra):
+    return dict(
+        id=attraction.pk,
+        name=attraction.name,
+        location=attraction.location,
+        category=attraction.get_category_display(),
+        url=reverse('attraction_detail', kwargs={'pk': attraction.pk}),
+        average_rating=attraction.average_rating,
+        **extra,
+    )
+
+
+def _attractions(ids):
+    return Attraction.objects.filter(status='APPROVED').in_bulk(ids)
+
+
+def window_start(window, now):
+    """Start of the oldest bucket in ``window``: the span ends with the current bucket."""
+    granularity, span = WINDOWS[window]
+    return bucket_start(now, granularity) - span + PERIOD[granularity]
+
+
+def compute_feed(window=DEFAULT_WINDOW, limit=FEED_SIZE):
+    granularity, _ = WINDOWS[window]
+    now = timezone.now()
+    recent = ReviewActivity.objects.filter(attraction__status='APPROVED').order_by()
+
+    top = list(
+        recent.filter(granularity=granularity, bucket_start__gte=window_start(window, now))
+        .values('attraction')
+        .annotate(reviews=Sum('count'), last=Max('last_review_at'))
+        .filter(reviews__gt=0)
+        .order_by('-reviews', '-last')[:limit]
+    )
+    latest = list(
+        recent.filter(granularity=ReviewActivity.HOURLY)
+        .values('attraction')
+        .annotate(last=Max('last_review_at'))
+        .order_by('-last')[:limit]
+    )
+
+    attractions = _attractions({row['attraction'] for row in top + latest})
+    return {
+        'window': window,
+        'trending': [
+            _describe(attractions[row['attraction']], reviews=row['reviews'])
+            for row in top if row['attraction'] in attractions
+        ],
+        'recently_reviewed': [
+            _describe(attractions[row['attraction']], last_review_at=row['last'].isoformat())
+            for row in latest if row['attraction'] in attractions
+        ],
+    }
+
+
+def get_feed(window=DEFAULT_WINDOW):
+    """The cached feed for ``window`` ('day' or 'week')."""
+    key = FEED_CACHE_KEY.format(window=window)
+    feed = cache.get(key)
+    if feed is None:
+        feed = compute_feed(window)
+        cache.set(key, feed, FEED_CACHE_SECONDS)
+    return feed
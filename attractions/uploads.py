@@ -0,0 +1,295 @@
+"""
+Image upload handling with bounded memory.
+
+Two paths get an attraction photo into storage:
+
+1. **Form upload, validated while streaming.** ``ImageUploadHandler`` runs
+   first in ``FILE_UPLOAD_HANDLERS`` and inspects each file as its chunks
+   arrive. The image header is parsed from the first few KB, so a file that
+   is not a supported image, has oversized dimensions, or grows past the
+   size limit is rejected (``SkipFile``) right away: the rest of the part
+   is discarded without being buffered, and the error is reported back to
+   the form through ``request.upload_errors``. Accepted files are spooled
+   by the regular handlers (memory up to ``FILE_UPLOAD_MAX_MEMORY_SIZE``,
+   then a temp file) and written to storage in chunks.
+
+2. **Direct upload.** The browser asks ``direct_upload_presign`` for an
+   upload target and sends the file there itself, so the bytes never pass
+   through a request worker. The form then receives only a signed token
+   naming the stored key. ``S3DirectUploadBackend`` issues real presigned
+   S3 POSTs (django-storages); ``LocalDirectUploadBackend`` is a stand-in
+   for development and tests that points at ``direct_upload`` on this site
+   and validates through path 1.
+
+   Every issued key is recorded as a ``DirectUpload``. Saving the form
+   claims it, so a token attaches its photo to one attraction at most;
+   ``manage.py cleanup_uploads`` deletes keys (and files) that were never
+   claimed once their token has expired.
+
+Pillow is imported lazily so worker boot does not pay for it.
+"""
+import io
+import os
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import default_storage
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import DirectUpload
+
+MAX_IMAGE_BYTES = 5 * 1024 * 1024
+MAX_IMAGE_DIMENSION = 8000  # pixels per side
+# Every supported format declares its size well within this many bytes.
+HEADER_SNIFF_BYTES = 64 * 1024
+
+ALLOWED_FORMATS = {
+    'JPEG': '.jpg',
+    'PNG': '.png',
+    'GIF': '.gif',
+    'WEBP': '.webp',
+}
+ALLOWED_CONTENT_TYPES = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/gif': '.gif',
+    'image/webp': '.webp',
+}
+
+UPLOAD_PREFIX = 'attraction_photos/'
+TOKEN_SALT = 'attractions.direct_upload'
+TOKEN_MAX_AGE = 60 * 60
+
+
+class ImageRejected(Exception):
+    """The uploaded bytes are not an acceptable image."""
+
+
+class ImageHeaderSniffer:
+    """
+    Feed chunks until the image format and dimensions are known.
+
+    ``feed()`` returns ``(format, (width, height))`` once decided, None while
+    more data is needed, and raises ImageRejected for unsupported or
+    oversized images.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def feed(self, chunk):
+        from PIL import Image, UnidentifiedImageError
+
+        self.buffer += chunk[:HEADER_SNIFF_BYTES - len(self.buffer)]
+        try:
+            with Image.open(io.BytesIO(self.buffer)) as image:
+                result = image.format, image.size
+        except Image.DecompressionBombError:
+            raise ImageRejected(
+                f"Image dimensions too large (maximum {MAX_IMAGE_DIMENSION}x{MAX_IMAGE_DIMENSION} pixels)."
+            )
+        except (UnidentifiedImageError, OSError, SyntaxError, ValueError):
+            if len(self.buffer) >= HEADER_SNIFF_BYTES:
+                raise ImageRejected(
+                    "Unsupported file format. Please upload a JPG, PNG, GIF, or WEBP image."
+                )
+            return None
+
+        image_format, (width, height) = result
+        if image_format not in ALLOWED_FORMATS:
+            raise ImageRejected(
+                "Unsupported file format. Please upload a JPG, PNG, GIF, or WEBP image."
+            )
+        if width > MAX_IMAGE_DIMENSION or height > MAX_IMAGE_DIMENSION:
+            raise ImageRejected(
+                f"Image dimensions too large (maximum {MAX_IMAGE_DIMENSION}x{MAX_IMAGE_DIMENSION} pixels)."
+            )
+        return result
+
+
+def inspect_image_header(data):
+    """One-shot version of ImageHeaderSniffer for bytes already in hand."""
+    result = ImageHeaderSniffer().feed(data[:HEADER_SNIFF_BYTES])
+    if result is None:
+        raise ImageRejected("Upload is not a valid image.")
+    return result
+
+
+class ImageUploadHandler(FileUploadHandler):
+    """
+    Validate uploaded files as they stream in; rejects are recorded in
+    ``request.upload_errors[field_name]`` and skipped without buffering.
+    Passes accepted chunks through to the next handler untouched.
+    """
+
+    def new_file(self, field_name, file_name, content_type, content_length, *args, **kwargs):
+        super().new_file(field_name, file_name, content_type, content_length, *args, **kwargs)
+        self.sniffer = ImageHeaderSniffer()
+        self.header_checked = False
+        if content_length is not None and content_length > MAX_IMAGE_BYTES:
+            self._reject("Image file too large (maximum 5MB).")
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > MAX_IMAGE_BYTES:
+            self._reject("Image file too large (maximum 5MB).")
+        if not self.header_checked:
+            try:
+                self.header_checked = self.sniffer.feed(raw_data) is not None
+            except ImageRejected as e:
+                self._reject(str(e))
+        return raw_data
+
+    def file_complete(self, file_size):
+        # The whole (small) file arrived without a recognisable header. It
+        # is already buffered by the next handler, so just flag it for the form.
+        if not self.header_checked and file_size:
+            self._record("Upload is not a valid image.")
+        return None
+
+    def _record(self, message):
+        if self.request is not None:
+            if not hasattr(self.request, 'upload_errors'):
+                self.request.upload_errors = {}
+            self.request.upload_errors[self.field_name] = message
+
+    def _reject(self, message):
+        self._record(message)
+        raise SkipFile(message)
+
+
+# --- DIRECT UPLOADS ---
+
+def new_upload_key(content_type):
+    """A fresh, unguessable storage key for an image of ``content_type``."""
+    return f"{UPLOAD_PREFIX}{uuid.uuid4().hex}{ALLOWED_CONTENT_TYPES[content_type]}"
+
+
+def sign_upload_key(key):
+    return signing.dumps(key, salt=TOKEN_SALT)
+
+
+def unsign_upload_key(token):
+    """Return the key in ``token``; raises signing.BadSignature if invalid or expired."""
+    key = signing.loads(token, salt=TOKEN_SALT, max_age=TOKEN_MAX_AGE)
+    if not key.startswith(UPLOAD_PREFIX) or os.path.basename(key) != key[len(UPLOAD_PREFIX):]:
+        raise signing.BadSignature("Unexpected upload key.")
+    return key
+
+
+def register_upload_key(key):
+    """Record a newly issued key so it can be claimed or cleaned up."""
+    DirectUpload.objects.create(key=key)
+
+
+def is_upload_claimable(key):
+    return DirectUpload.objects.filter(key=key, claimed_at__isnull=True).exists()
+
+
+def claim_upload_key(key):
+    """
+    Mark ``key`` as used. Returns False if it was never issued or has been
+    claimed already; the conditional update makes concurrent claims safe.
+    """
+    return bool(
+        DirectUpload.objects.filter(key=key, claimed_at__isnull=True).update(claimed_at=timezone.now())
+    )
+
+
+def delete_expired_uploads(batch_size=500):
+    """
+    Forget keys whose token can no longer be used. Files behind keys that
+    were never claimed are deleted from storage. Returns the number of
+    orphaned files removed.
+    """
+    expired = DirectUpload.objects.filter(
+        created_at__lt=timezone.now() - timedelta(seconds=TOKEN_MAX_AGE)
+    ).order_by('pk')
+    removed = 0
+    while True:
+        batch = list(expired.values_list('pk', 'key', 'claimed_at')[:batch_size])
+        if not batch:
+            return removed
+        for _, key, claimed_at in batch:
+            if claimed_at is None and default_storage.exists(key):
+                default_storage.delete(key)
+                removed += 1
+        DirectUpload.objects.filter(pk__in=[pk for pk, _, _ in batch]).delete()
+
+
+class DirectUploadBackend:
+    """Issues browser upload targets and checks what arrived."""
+
+    def presign(self, key, content_type):
+        """
+        Return ``{'url': ..., 'fields': {...}}``: the browser POSTs a
+        multipart form with ``fields`` followed by the image as ``file``.
+        """
+        raise NotImplementedError
+
+    def verify(self, key):
+        """Raise ImageRejected unless ``key`` holds an acceptable image."""
+        raise NotImplementedError
+
+
+class LocalDirectUploadBackend(DirectUploadBackend):
+    """Stand-in for development and tests: uploads go to this site's direct_upload view."""
+
+    def presign(self, key, content_type):
+        return {
+            'url': reverse('direct_upload', kwargs={'token': sign_upload_key(key)}),
+            'fields': {},
+        }
+
+    def verify(self, key):
+        if not default_storage.exists(key):
+            raise ImageRejected("The uploaded image could not be found. Please upload it again.")
+        if default_storage.size(key) > MAX_IMAGE_BYTES:
+            raise ImageRejected("Image file too large (maximum 5MB).")
+        with default_storage.open(key) as stored:
+            inspect_image_header(stored.read(HEADER_SNIFF_BYTES))
+
+
+class S3DirectUploadBackend(DirectUploadBackend):
+    """
+    Presigned S3 POSTs via django-storages' S3 storage. S3 itself enforces
+    the size limit and content type through the policy conditions.
+    """
+
+    expires_in = 10 * 60
+
+    def _client(self):
+        return default_storage.connection.meta.client
+
+    def presign(self, key, content_type):
+        return self._client().generate_presigned_post(
+            Bucket=default_storage.bucket_name,
+            Key=default_storage._normalize_name(key),
+            Fields={'Content-Type': content_type},
+            Conditions=[
+                {'Content-Type': content_type},
+                ['content-length-range', 1, MAX_IMAGE_BYTES],
+            ],
+            ExpiresIn=self.expires_in,
+        )
+
+    def verify(self, key):
+        # Size was enforced by the policy; fetch only the header bytes.
+        try:
+            stored = self._client().get_object(
+                Bucket=default_storage.bucket_name,
+                Key=default_storage._normalize_name(key),
+                Range=f'bytes=0-{HEADER_SNIFF_BYTES - 1}',
+            )
+        except Exception:
+            raise ImageRejected("The uploaded image could not be found. Please upload it again.")
+        inspect_image_header(stored['Body'].read())
+
+
+def get_direct_upload_backend():
+    path = getattr(settings, 'DIRECT_UPLOAD_BACKEND', 'attractions.uploads.LocalDirectUploadBackend')
+    return import_string(path)()
@@ -1,6 +1,8 @@
 from django.urls import path
 from .views import (
     AttractionListView,
+    AttractionAutocompleteView,
+    TrendingFeedView,
     AttractionDetailView,
     AttractionCreateView,
     AttractionUpdateView,
@@ -8,6 +10,8 @@ from .views import (
     RegisterView,
     MyAttractionListView,
     ReviewCreateView, # Imported new view
+    DirectUploadPresignView,
+    DirectUploadView,
 )
 
 urlpatterns = [
@@ -20,6 +24,16 @@ urlpatterns = [
     # REVIEW ROUTE (Submit a review for a specific attraction ID)
     path('<int:pk>/review/', ReviewCreateView.as_view(), name='add_review'),
     
+    # SEARCH AUTOCOMPLETE ROUTE (JSON suggestions for the search box)
+    path('autocomplete/', AttractionAutocompleteView.as_view(), name='attraction_autocomplete'),
+    
+    # TRENDING FEED ROUTE (JSON trending and recently-reviewed attractions)
+    path('trending/', TrendingFeedView.as_view(), name='trending_feed'),
+    
+    # DIRECT IMAGE UPLOAD ROUTES (browser sends photos straight to storage)
+    path('uploads/presign/', DirectUploadPresignView.as_view(), name='direct_upload_presign'),
+    path('uploads/direct/<str:token>/', DirectUploadView.as_view(), name='direct_upload'),
+    
     # CRUD ROUTES
     path('', AttractionListView.as_view(), name='attraction_list'),
     path('add/', AttractionCreateView.as_view(), name='attraction_create'),
@@ -7,20 +7,44 @@ from django.views.generic import (
     DeleteView,
     View 
 )
-from django.db.models import Q, Avg 
+from django.db import IntegrityError, transaction
+from django.db.models import Q, Count, Sum 
+from django.contrib import admin
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import FileResponse, Http404, JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
+from django.utils.cache import patch_cache_control
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin 
 from django.contrib.auth import login 
+from django.conf import settings
 from django.contrib import messages
+from django.core import signing
+from django.core.files.storage import default_storage
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt
 from .models import Attraction, Review 
+from .profiling import ProfileStore
 from .forms import CustomUserCreationForm, ReviewForm, AttractionForm 
+from .search import MAX_RESULTS, autocomplete
+from .trending import DEFAULT_WINDOW, WINDOWS, get_feed
+from .uploads import (
+    ALLOWED_CONTENT_TYPES,
+    claim_upload_key,
+    get_direct_upload_backend,
+    is_upload_claimable,
+    new_upload_key,
+    register_upload_key,
+    sign_upload_key,
+    unsign_upload_key,
+)
 
 # --- REVIEW CREATION VIEW ---
 
 class ReviewCreateView(LoginRequiredMixin, View):
     def post(self, request, pk):
         attraction = get_object_or_404(Attraction, pk=pk)
-        existing_review = Review.objects.filter(attraction=attraction, user=request.user).exists()
+        # Archived reviews count too: they still feed the attraction's rating.
+        existing_review = attraction.has_review_from(request.user)
         
         if existing_review:
             messages.warning(request, 'You have already submitted a review for this attraction.')
@@ -31,7 +55,13 @@ class ReviewCreateView(LoginRequiredMixin, View):
             review = form.save(commit=False)
             review.attraction = attraction
             review.user = request.user
-            review.save()
+            try:
+                with transaction.atomic():
+                    review.save()
+            except IntegrityError:
+                # A concurrent duplicate submission won the unique_together race.
+                messages.warning(request, 'You have already submitted a review for this attraction.')
+                return redirect('attraction_detail', pk=pk)
             messages.success(request, 'Thank you! Your review has been submitted.')
         else:
             messages.error(request, 'Please correct the errors in your review.')
@@ -64,6 +94,19 @@ class RegisterView(View):
 
 # --- R (Read) Views ---
 
+def map_markers(attractions):
+    """Marker data for map.js, serialized once with json_script."""
+    return [
+        {
+            'id': attraction.pk,
+            'name': attraction.name,
+            'location': attraction.location,
+            'latitude': str(attraction.latitude),
+            'longitude': str(attraction.longitude),
+        }
+        for attraction in attractions
+    ]
+
 class AttractionListView(ListView):
     """Displays a list of APPROVED attractions only."""
     model = Attraction
@@ -72,10 +115,9 @@ class AttractionListView(ListView):
     paginate_by = 10 
 
     def get_queryset(self):
-        # 1. Filter: Only show APPROVED attractions to the public
-        queryset = Attraction.objects.filter(status='APPROVED').annotate(
-            average_rating=Avg('reviews__rating')
-        )
+        # 1. Filter: Only show APPROVED attractions to the public.
+        # Ratings come from Attraction.review_count/rating_total, no join needed.
+        queryset = Attraction.objects.filter(status='APPROVED')
         
         # 2. Handle Search Query
         query = self.request.GET.get('q')
@@ -98,22 +140,113 @@ class AttractionListView(ListView):
         context['query'] = self.request.GET.get('q', '')
         context['category_filter'] = self.request.GET.get('category', 'ALL')
         context['categories'] = Attraction.category.field.choices
+        context['map_markers'] = map_markers(context['object_list'])
+        # Trending feed only on the unfiltered first page; it is one cache read.
+        if not context['query'] and context['category_filter'] == 'ALL' and self.request.GET.get('page', '1') == '1':
+            context['trending'] = get_feed()
         return context
 
+class AttractionAutocompleteView(View):
+    """
+    JSON suggestions for the search box, served from the in-memory
+    prefix index so keystrokes never hit the database.
+    """
+    def get(self, request):
+        query = request.GET.get('q', '').strip()
+        try:
+            limit = max(1, min(int(request.GET.get('limit', 8)), MAX_RESULTS))
+        except ValueError:
+            limit = 8
+
+        results = autocomplete(query, limit) if query else []
+        response = JsonResponse({'query': query, 'results': results})
+        patch_cache_control(response, public=True, max_age=60)
+        return response
+
+class TrendingFeedView(View):
+    """
+    JSON trending and recently-reviewed attractions, read from the cached
+    feed built over the hourly/daily review buckets (see trending.py).
+    """
+    def get(self, request):
+        window = request.GET.get('window', DEFAULT_WINDOW)
+        if window not in WINDOWS:
+            window = DEFAULT_WINDOW
+        response = JsonResponse(get_feed(window))
+        patch_cache_control(response, public=True, max_age=60)
+        return response
+
 class MyAttractionListView(LoginRequiredMixin, ListView):
     """
-    Displays all attractions contributed by the logged-in user,
-    regardless of whether they are Pending or Approved.
+    Contributor dashboard: all attractions contributed by the logged-in
+    user (Pending, Approved or Rejected), per-status counts, and the latest
+    reviews left on them.
+
+    Everything comes from three indexed queries regardless of how many
+    attractions the user has: one grouped count per status (which also
+    sums the maintained review counters and feeds the paginator), one page
+    of attractions, and one page of recent reviews read newest-first from
+    the ``(attraction_contributor, -created_at)`` index.
     """
     model = Attraction
     template_name = 'attractions/my_attractions.html'
     context_object_name = 'attractions'
     paginate_by = 10 
+    recent_reviews_limit = 5
+
+    def get_status_filter(self):
+        status = self.request.GET.get('status', 'ALL')
+        return status if status in dict(Attraction.STATUS_CHOICES) else 'ALL'
+
+    def get_status_summary(self):
+        """Return ``{status: (attractions, reviews)}`` for the user, cached on the view."""
+        if not hasattr(self, '_status_summary'):
+            rows = (
+                Attraction.objects.filter(contributor=self.request.user)
+                .order_by()
+                .values('status')
+                .annotate(total=Count('id'), reviews=Sum('review_count'))
+            )
+            self._status_summary = {
+                row['status']: (row['total'], row['reviews'] or 0) for row in rows
+            }
+        return self._status_summary
 
     def get_queryset(self):
-        return Attraction.objects.filter(contributor=self.request.user).annotate(
-            average_rating=Avg('reviews__rating')
-        ).order_by('-created_at')
+        queryset = Attraction.objects.filter(contributor=self.request.user)
+        status = self.get_status_filter()
+        if status != 'ALL':
+            queryset = queryset.filter(status=status)
+        return queryset.order_by('-created_at')
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        paginator = super().get_paginator(queryset, per_page, **kwargs)
+        # The status summary already knows the total; skip the COUNT(*) query.
+        summary = self.get_status_summary()
+        status = self.get_status_filter()
+        if status == 'ALL':
+            paginator.count = sum(total for total, _ in summary.values())
+        else:
+            paginator.count = summary.get(status, (0, 0))[0]
+        return paginator
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        summary = self.get_status_summary()
+
+        context['status_filter'] = self.get_status_filter()
+        context['status_counts'] = [
+            (code, label, summary.get(code, (0, 0))[0])
+            for code, label in Attraction.STATUS_CHOICES
+        ]
+        context['total_contributions'] = sum(total for total, _ in summary.values())
+        context['total_reviews_received'] = sum(reviews for _, reviews in summary.values())
+        context['recent_reviews'] = (
+            Review.objects.filter(attraction_contributor=self.request.user)
+            .select_related('attraction', 'user')
+            .order_by('-created_at')[:self.recent_reviews_limit]
+        )
+        return context
 
 
 class AttractionDetailView(DetailView):
@@ -139,12 +272,13 @@ class AttractionDetailView(DetailView):
         attraction = self.object
         user = self.request.user
 
-        avg_rating = attraction.reviews.aggregate(Avg('rating'))['rating__avg']
-        context['average_rating'] = avg_rating if avg_rating is not None else 0
-        context['full_reviews'] = attraction.reviews.all()
+        context['average_rating'] = attraction.average_rating or 0
+        context['full_reviews'] = list(attraction.reviews.select_related('user'))
+        # Archived reviews are not listed but still count in the rating.
+        context['archived_review_count'] = max(0, attraction.review_count - len(context['full_reviews']))
 
         if user.is_authenticated:
-            has_reviewed = attraction.reviews.filter(user=user).exists()
+            has_reviewed = attraction.has_review_from(user)
             context['has_reviewed'] = has_reviewed
             if not has_reviewed:
                 context['review_form'] = ReviewForm()
@@ -154,12 +288,29 @@ class AttractionDetailView(DetailView):
 
 # --- C, U, D Views ---
 
-class AttractionCreateView(LoginRequiredMixin, CreateView):
+class ImageUploadFormMixin:
+    """Passes rejections from ImageUploadHandler (request.upload_errors) to AttractionForm."""
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        # Reading request.FILES above has already run the upload handlers.
+        kwargs['upload_errors'] = getattr(self.request, 'upload_errors', {})
+        return kwargs
+
+    def claim_direct_upload(self, form):
+        """Claim the form's direct upload, if any; False if another form got it first."""
+        if form.direct_upload_key is None or claim_upload_key(form.direct_upload_key):
+            return True
+        form.add_error('image', "This photo upload has already been used. Please choose the image again.")
+        return False
+
+class AttractionCreateView(LoginRequiredMixin, ImageUploadFormMixin, CreateView):
     model = Attraction
     form_class = AttractionForm
     template_name = 'attractions/attraction_form.html'
 
     def form_valid(self, form):
+        if not self.claim_direct_upload(form):
+            return self.form_invalid(form)
         form.instance.contributor = self.request.user
         
         # LOGIC: Admins get auto-approved; Regular users go to PENDING
@@ -172,7 +323,7 @@ class AttractionCreateView(LoginRequiredMixin, CreateView):
             
         return super().form_valid(form)
 
-class AttractionUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
+class AttractionUpdateView(LoginRequiredMixin, UserPassesTestMixin, ImageUploadFormMixin, UpdateView):
     model = Attraction
     form_class = AttractionForm
     template_name = 'attractions/attraction_form.html'
@@ -183,6 +334,8 @@ class AttractionUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
         return self.request.user == attraction.contributor or self.request.user.is_staff
     
     def form_valid(self, form):
+        if not self.claim_direct_upload(form):
+            return self.form_invalid(form)
         # If updated by non-admin, reset status to PENDING
         if not self.request.user.is_staff and form.instance.status == 'APPROVED':
             form.instance.status = 'PENDING'
@@ -199,4 +352,90 @@ class AttractionDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
     def test_func(self):
         attraction = self.get_object()
         # Allow if User is the Contributor OR User is an Admin
-        return self.request.user == attraction.contributor or self.request.user.is_staff
\ No newline at end of file
+        return self.request.user == attraction.contributor or self.request.user.is_staff
+
+
+# --- DIRECT IMAGE UPLOAD VIEWS ---
+
+class DirectUploadPresignView(LoginRequiredMixin, View):
+    """
+    Hands the browser an upload target for one photo, plus a signed token
+    the attraction form accepts in place of the file itself.
+    """
+    def post(self, request):
+        content_type = request.POST.get('content_type', '')
+        if content_type not in ALLOWED_CONTENT_TYPES:
+            return JsonResponse(
+                {'error': 'Unsupported file format. Please upload a JPG, PNG, GIF, or WEBP image.'},
+                status=400,
+            )
+        key = new_upload_key(content_type)
+        register_upload_key(key)
+        return JsonResponse({
+            'upload': get_direct_upload_backend().presign(key, content_type),
+            'token': sign_upload_key(key),
+        })
+
+@method_decorator(csrf_exempt, name='dispatch')
+class DirectUploadView(View):
+    """
+    Local stand-in for a presigned storage POST (LocalDirectUploadBackend).
+    The signed token in the URL is the authorization, as with S3, and the
+    file is validated by ImageUploadHandler while it streams in.
+    """
+    def post(self, request, token):
+        try:
+            key = unsign_upload_key(token)
+        except signing.BadSignature:
+            return JsonResponse({'error': 'Upload link is invalid or has expired.'}, status=403)
+
+        upload = request.FILES.get('file')
+        upload_errors = getattr(request, 'upload_errors', {})
+        if 'file' in upload_errors or upload is None:
+            return JsonResponse({'error': upload_errors.get('file', 'No file was uploaded.')}, status=400)
+        if default_storage.exists(key) or not is_upload_claimable(key):
+            return JsonResponse({'error': 'This upload link has already been used.'}, status=409)
+
+        # Storage writes the spooled file in chunks.
+        default_storage.save(key, upload)
+        return JsonResponse({'key': key}, status=201)
+
+
+# --- REQUEST PROFILING VIEWS (admin) ---
+
+@staff_member_required
+def profile_list_view(request):
+    """Ring buffer of profiled requests (see profiling.py)."""
+    context = dict(
+        admin.site.each_context(request),
+        title='Request profiles',
+        profiles=ProfileStore().list(),
+        profiling_enabled=settings.PROFILING_ENABLED,
+    )
+    return render(request, 'admin/attractions/profile_list.html', context)
+
+@staff_member_required
+def profile_detail_view(request, profile_id):
+    store = ProfileStore()
+    profile = store.get(profile_id)
+    if profile is None:
+        raise Http404("Profile not found (it may have rotated out of the buffer).")
+    context = dict(
+        admin.site.each_context(request),
+        title=f"Profile of {profile['method']} {profile['path']}",
+        profile=profile,
+        slowest_queries=sorted(profile['sql'], key=lambda q: -q['ms'])[:20],
+    )
+    return render(request, 'admin/attractions/profile_detail.html', context)
+
+@staff_member_required
+def profile_download_view(request, profile_id):
+    store = ProfileStore()
+    profile = store.get(profile_id)
+    if profile is None or not store.artifact_path(profile).exists():
+        raise Http404("Profile not found (it may have rotated out of the buffer).")
+    return FileResponse(
+        open(store.artifact_path(profile), 'rb'),
+        as_attachment=True,
+        filename=profile['artifact'],
+    )
\ No newline at end of file
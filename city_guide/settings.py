@@ -14,6 +14,10 @@ SECRET_KEY = config('SECRET_KEY')
 # Reads DEBUG flag from the .env file. MUST be False in production!
 DEBUG = config('DEBUG', default=True, cast=bool)
 
+# Warm caches and imports at application load so gunicorn can preload the app
+# in its master and fork ready-to-serve workers (see gunicorn.conf.py).
+LEAN_BOOT = config('LEAN_BOOT', default=False, cast=bool)
+
 # Reads ALLOWED_HOSTS from the .env file (e.g., 'yourdomain.com')
 ALLOWED_HOSTS = config('ALLOWED_HOSTS', default='127.0.0.1,localhost', cast=Csv())
 
@@ -36,8 +40,12 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # Removes itself unless PROFILING_ENABLED; needs request.user.
+    'attractions.profiling.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Needs request.user, so it must come after AuthenticationMiddleware.
+    'attractions.ratelimit.RateLimitMiddleware',
 ]
 
 ROOT_URLCONF = 'city_guide.urls'
@@ -58,6 +66,17 @@ TEMPLATES = [
     },
 ]
 
+# In production, load templates through the cached loader explicitly so each
+# template is read and compiled once per process.
+if not DEBUG:
+    TEMPLATES[0]['APP_DIRS'] = False
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+
 WSGI_APPLICATION = 'city_guide.wsgi.application'
 
 
@@ -83,6 +102,39 @@ else:
     }
 
 
+# --- CACHE CONFIGURATION ---
+# Defaults to a per-process memory cache. Point CACHE_BACKEND/CACHE_LOCATION
+# at a shared cache (e.g. Redis or Memcached) in production so every worker
+# sees the same catalog version and counters.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='city-guide'),
+    },
+    # Used automatically by {% cache %}; sized to hold a card per attraction.
+    'template_fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'city-guide-fragments',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+}
+
+
+# --- RATE LIMITING (write endpoints) ---
+# Token buckets per URL name, keyed by user (or client IP when anonymous).
+# '5/m' allows bursts of 5 that refill at 5 per minute. See attractions/ratelimit.py.
+RATELIMIT_ENABLED = config('RATELIMIT_ENABLED', default=True, cast=bool)
+# Production runs behind Render's proxy, so by default limits apply per client
+# (rightmost X-Forwarded-For entry), not per proxy. Set False when serving directly.
+RATELIMIT_USE_X_FORWARDED_FOR = config('RATELIMIT_USE_X_FORWARDED_FOR', default=not DEBUG, cast=bool)
+RATELIMITS = {
+    'add_review': '5/m',
+    'attraction_create': '10/h',
+    'attraction_update': '30/h',
+    'register': '5/h',
+    'direct_upload_presign': '30/h',
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',},
@@ -112,6 +164,30 @@ MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 
+# --- REQUEST PROFILING (staff only, see attractions/profiling.py) ---
+# Add ?_profile=1 (cProfile) or ?_profile=sample (stack sampling) to a URL
+# as staff; results are browsable at /admin/profiles/.
+PROFILING_ENABLED = config('PROFILING_ENABLED', default=False, cast=bool)
+# Fraction of staff requests sampled automatically, without ?_profile.
+PROFILING_SAMPLE_RATE = config('PROFILING_SAMPLE_RATE', default=0.0, cast=float)
+PROFILING_DIR = config('PROFILING_DIR', default=str(BASE_DIR / 'profiles'))
+PROFILING_MAX_ENTRIES = config('PROFILING_MAX_ENTRIES', default=50, cast=int)
+
+# --- UPLOAD HANDLING ---
+# ImageUploadHandler validates every uploaded file (this site only takes
+# photos) as it streams in and drops bad ones early; accepted files are kept
+# in memory only up to FILE_UPLOAD_MAX_MEMORY_SIZE, then spooled to disk.
+FILE_UPLOAD_HANDLERS = [
+    'attractions.uploads.ImageUploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+FILE_UPLOAD_MAX_MEMORY_SIZE = 256 * 1024
+
+# Where the browser sends photos directly. Use
+# 'attractions.uploads.S3DirectUploadBackend' with django-storages' S3 storage.
+DIRECT_UPLOAD_BACKEND = config('DIRECT_UPLOAD_BACKEND', default='attractions.uploads.LocalDirectUploadBackend')
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # --- AUTH REDIRECTS ---
@@ -6,7 +6,14 @@ from django.views.generic import RedirectView
 from django.conf import settings
 from django.conf.urls.static import static
 
+from attractions.views import profile_detail_view, profile_download_view, profile_list_view
+
 urlpatterns = [
+    # Request profiles (staff only), listed before the admin's catch-all.
+    path('admin/profiles/', profile_list_view, name='profile_list'),
+    path('admin/profiles/<str:profile_id>/', profile_detail_view, name='profile_detail'),
+    path('admin/profiles/<str:profile_id>/download/', profile_download_view, name='profile_download'),
+
     path('admin/', admin.site.urls),
 
     # 1. Include Django's default authentication URLs (login, logout, etc.)
@@ -0,0 +1,61 @@
+"""
+Pre-fork warm-up for LEAN_BOOT.
+
+With gunicorn's ``preload_app`` (see gunicorn.conf.py) the application is
+imported once in the master and workers are forked from it, inheriting
+every imported module, the populated URL resolver, compiled templates and
+the search index through copy-on-write memory. A new worker then only has
+to fork, not import Django, the admin, Pillow and the project from
+scratch.
+"""
+import logging
+import time
+
+from django.core.cache import caches
+from django.db import connections
+from django.template.loader import get_template
+from django.urls import reverse
+
+logger = logging.getLogger(__name__)
+
+# Templates on the hot paths; compiled into the cached loader.
+WARM_TEMPLATES = [
+    'base.html',
+    'attractions/attraction_list.html',
+    'attractions/attraction_detail.html',
+    'attractions/my_attractions.html',
+    'attractions/attraction_form.html',
+    'registration/login.html',
+    '404.html',
+    '500.html',
+]
+
+
+def warm_up():
+    start = time.perf_counter()
+
+    # Resolving one name populates the whole URLconf, admin included.
+    reverse('attraction_list')
+
+    for name in WARM_TEMPLATES:
+        get_template(name)
+
+    # Pulled in lazily otherwise; importing in the master makes them free
+    # for every forked worker.
+    import PIL.Image  # noqa: F401
+    import attractions.uploads  # noqa: F401
+
+    try:
+        from attractions.search import get_index
+        get_index(wait=True)
+    except Exception:
+        # No database yet (e.g. during a build step): workers build lazily.
+        logger.warning("Skipping search index warm-up.", exc_info=True)
+    finally:
+        # Never hand an open database connection or cache client socket
+        # (memcached/Redis) to forked workers.
+        connections.close_all()
+        for cache in caches.all():
+            cache.close()
+
+    logger.info("Warm-up finished in %.0f ms.", (time.perf_counter() - start) * 1000)
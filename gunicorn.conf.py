@@ -0,0 +1,6 @@
+# Gunicorn reads this file automatically when started from the project root.
+from decouple import config
+
+# LEAN_BOOT: import and warm the app once in the master (city_guide/warmup.py),
+# then fork workers from it so new workers join the pool without a cold start.
+preload_app = config('LEAN_BOOT', default=False, cast=bool)